@@ -3,6 +3,8 @@ from ninja_jwt.controller import NinjaJWTDefaultController
 from ninja_jwt.authentication import JWTAuth
 from typing import List, Dict, Any
 
+from .renderers import ORJSONRenderer
+
 # Import controllers from apps
 from users.api import UserController
 from users.admin_api import AdminUserController
@@ -21,6 +23,7 @@ api = NinjaExtraAPI(
     title="House Rental API",
     version="1.0.0",
     description="API for House Rental Management System",
+    renderer=ORJSONRenderer(),
 )
 
 # Register the JWT controller for authentication
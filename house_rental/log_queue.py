@@ -0,0 +1,24 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_listeners = {}
+
+def start_queue_logging(*logger_names):
+    """
+    Move the handlers configured in LOGGING for the given loggers behind background
+    QueueListeners, so request threads only enqueue records instead of writing them.
+    """
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        if name in _listeners or not logger.handlers:
+            continue
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+        logger.handlers = [QueueHandler(log_queue)]
+        listener.start()
+        # Flush whatever is still queued when the worker shuts down
+        atexit.register(listener.stop)
+        _listeners[name] = listener
@@ -0,0 +1,20 @@
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+import orjson
+
+# Types orjson cannot encode (Decimal, lazy strings, models) and datetimes are handed to
+# the default Ninja encoder, so values are formatted exactly as the stock JSON renderer does
+_fallback_encoder = NinjaJSONEncoder()
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson's C encoder.
+    """
+    media_type = "application/json"
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(
+            data,
+            default=_fallback_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
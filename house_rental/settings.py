@@ -151,7 +151,10 @@ if os.environ.get('DB_ENGINE') == 'django.db.backends.postgresql':
             'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
             'HOST': os.environ.get('DB_HOST', 'localhost'),
             'PORT': os.environ.get('DB_PORT', '5432'),
-            'CONN_MAX_AGE': 600,  # Connection pooling
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),  # Persistent connections
+            'CONN_HEALTH_CHECKS': True,  # Replace persistent connections the server has dropped
+            # pgbouncer in transaction pooling mode cannot keep server-side cursors open across queries
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_PGBOUNCER', 'False').lower() == 'true',
             'OPTIONS': {
                 'connect_timeout': 10,
             }
@@ -0,0 +1,17 @@
+"""
+Django settings for running the test suite.
+
+Used by `manage.py test` unless DJANGO_SETTINGS_MODULE is set explicitly.
+"""
+from .settings import *  # noqa: F401,F403
+
+# The default PBKDF2 hasher dominates the cost of creating fixture users
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Keep the test database in memory regardless of the configured backend
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
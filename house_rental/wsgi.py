@@ -11,6 +11,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from house_rental.log_queue import start_queue_logging
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'house_rental.settings')
 
 application = get_wsgi_application()
+
+# Serve requests with log writes handed to a background thread
+start_queue_logging('django', 'house_rental')
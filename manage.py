@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'house_rental.settings')
+    # Tests run against lighter settings (fast password hashing, in-memory database)
+    settings_module = 'house_rental.test_settings' if sys.argv[1:2] == ['test'] else 'house_rental.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
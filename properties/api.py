@@ -39,7 +39,7 @@ class PropertyController:
                 **data.dict()
             )
             logger.info(f"Property created successfully: {property_obj.id}")
-            return 201, self.property_service.get_property_details(property_obj.id)
+            return 201, self.property_service.get_property_details_for(property_obj)
         except ValueError as e:
             logger.warning(f"Property creation failed: {str(e)}")
             return 400, {"message": str(e)}
@@ -60,7 +60,7 @@ class PropertyController:
         search_params = {}
         
         # Debug log raw request parameters
-        logger.info(f"Raw GET parameters: {request.GET}")
+        logger.debug("Raw GET parameters: %s", request.GET)
         
         # Extract search parameters directly from request.GET for more reliable access
         if 'city' in request.GET:
@@ -85,7 +85,7 @@ class PropertyController:
             search_dict = search.dict(exclude_unset=True)
             search_params.update(search_dict)
             
-        logger.info(f"Final search parameters: {search_params}")
+        logger.debug("Final search parameters: %s", search_params)
 
         # Extract owner parameter from search_params
         owner = search_params.pop('owner', None) if search_params else None
@@ -110,23 +110,21 @@ class PropertyController:
         # Process bedrooms filter - it's already handled as gte in the repository
         # The frontend sends values like "1", "2", etc. which are interpreted as "1+", "2+", etc.
 
-        # Get total count
-        total = self.property_service.count_properties(owner=current_user, **search_params)
-
         # Check if this is a request for landlord properties
         include_all_images = True
         if owner == 'current':
             # For landlord properties, don't include all images to improve performance
             include_all_images = False
 
-        # Get paginated results
-        properties = self.property_service.search_properties(
+        # Get paginated results and the total in one round trip
+        page_data = self.property_service.search_properties_page(
             page=page,
             page_size=page_size,
             include_all_images=include_all_images,
             owner=current_user,
             **search_params
         )
+        total = page_data['total']
 
         # Calculate total pages
         total_pages = (total + page_size - 1) // page_size if total > 0 else 0
@@ -136,7 +134,8 @@ class PropertyController:
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
-            "results": properties
+            "has_next": page * page_size < total,
+            "results": page_data['results']
         }
 
     @route.get("/my-properties", auth=JWTAuth(), response=List[PropertySummarySchema])
@@ -156,7 +155,7 @@ class PropertyController:
             )
             if not property_obj:
                 return 404, {"message": "Property not found"}
-            return 200, self.property_service.get_property_details(property_obj.id)
+            return 200, self.property_service.get_property_details_for(property_obj)
         except ValueError as e:
             return 400, {"message": str(e)}
 
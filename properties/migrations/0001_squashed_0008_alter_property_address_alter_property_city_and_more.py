@@ -0,0 +1,114 @@
+# Generated by Django 5.2 on 2026-10-16 00:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('properties', '0001_initial'), ('properties', '0002_initial'), ('properties', '0003_property_document_verification_status_and_more'), ('properties', '0004_alter_property_document_verification_status'), ('properties', '0005_propertydocument_feedback'), ('properties', '0006_propertydocument_feedback_read'), ('properties', '0007_documentfeedback'), ('properties', '0008_alter_property_address_alter_property_city_and_more')]
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Property',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('property_type', models.CharField(choices=[('apartment', 'Apartment'), ('house', 'House'), ('duplex', 'Duplex'), ('townhouse', 'Townhouse'), ('villa', 'Villa'), ('studio', 'Studio'), ('other', 'Other')], default='apartment', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending Approval'), ('approved', 'Approved'), ('denied', 'Denied'), ('rented', 'Rented')], default='pending', max_length=20)),
+                ('address', models.CharField(help_text='Google Autocomplete Address', max_length=255)),
+                ('city', models.CharField(help_text='Google Autocomplete City', max_length=100)),
+                ('state', models.CharField(help_text='Google Autocomplete State', max_length=100)),
+                ('country', models.CharField(default='Rwanda', help_text='Google Autocomplete Country, always Rwanda', max_length=100)),
+                ('zip_code', models.CharField(max_length=20)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, help_text='Google Autocomplete Latitude', max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, help_text='Google Autocomplete Longitude', max_digits=9, null=True)),
+                ('bedrooms', models.PositiveIntegerField(default=1)),
+                ('bathrooms', models.DecimalField(decimal_places=1, default=1.0, max_digits=3)),
+                ('area', models.PositiveIntegerField(help_text='Area in square feet')),
+                ('price_per_night', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('has_wifi', models.BooleanField(default=False)),
+                ('has_kitchen', models.BooleanField(default=False)),
+                ('has_air_conditioning', models.BooleanField(default=False)),
+                ('has_heating', models.BooleanField(default=False)),
+                ('has_tv', models.BooleanField(default=False)),
+                ('has_parking', models.BooleanField(default=False)),
+                ('has_pool', models.BooleanField(default=False)),
+                ('has_gym', models.BooleanField(default=False)),
+                ('has_maid_service', models.BooleanField(default=False)),
+                ('has_car_rental', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='properties', to=settings.AUTH_USER_MODEL)),
+                ('document_verification_status', models.CharField(blank=True, choices=[('not_submitted', 'Not Submitted'), ('pending', 'Pending Verification'), ('verified', 'Verified'), ('rejected', 'Rejected')], default='not_submitted', help_text='Status of document verification for this property', max_length=20, null=True)),
+            ],
+            options={
+                'verbose_name': 'Property',
+                'verbose_name_plural': 'Properties',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PropertyImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='property_images/')),
+                ('caption', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_primary', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='properties.property')),
+            ],
+            options={
+                'verbose_name': 'Property Image',
+                'verbose_name_plural': 'Property Images',
+                'ordering': ['-is_primary', 'created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PropertyDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document_type', models.CharField(choices=[('deed', 'Property Deed'), ('tax', 'Property Tax Document'), ('utility', 'Utility Bill'), ('insurance', 'Property Insurance'), ('id', 'ID Card with Address'), ('other', 'Other Document')], default='other', max_length=20)),
+                ('document', models.FileField(upload_to='property_documents/')),
+                ('description', models.TextField(blank=True, help_text='Additional information about the document', null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=20)),
+                ('rejection_reason', models.TextField(blank=True, help_text='Reason for rejection if applicable', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='properties.property')),
+                ('feedback', models.TextField(blank=True, help_text='Feedback for the document owner without changing status', null=True)),
+                ('feedback_read', models.BooleanField(default=False, help_text='Whether the feedback has been read by the owner')),
+            ],
+            options={
+                'verbose_name': 'Property Document',
+                'verbose_name_plural': 'Property Documents',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DocumentFeedback',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sender_type', models.CharField(choices=[('admin', 'Admin'), ('landlord', 'Landlord')], help_text='Type of user who sent this feedback', max_length=10)),
+                ('message', models.TextField(help_text='Feedback message')),
+                ('is_read', models.BooleanField(default=False, help_text='Whether this feedback has been read by the recipient')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_thread', to='properties.propertydocument')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_feedback', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Document Feedback',
+                'verbose_name_plural': 'Document Feedback',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-15 22:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_alter_property_address_alter_property_city_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documentfeedback',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['document', 'sender_type'], name='docfeedback_unread_idx'),
+        ),
+    ]
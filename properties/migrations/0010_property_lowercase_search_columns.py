@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-15 22:56
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_documentfeedback_unread_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='city_lower',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('city'), output_field=models.CharField(max_length=100)),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='property_type_lower',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('property_type'), output_field=models.CharField(max_length=20)),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city_lower'], name='property_city_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['property_type_lower'], name='property_type_lower_idx'),
+        ),
+    ]
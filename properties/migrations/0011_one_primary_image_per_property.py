@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-15 22:59
+
+from django.db import migrations, models
+
+
+def demote_duplicate_primary_images(apps, schema_editor):
+    """Keep only the oldest primary image of each property before adding the constraint."""
+    PropertyImage = apps.get_model('properties', 'PropertyImage')
+    seen = set()
+    duplicates = []
+    for image_id, property_id in PropertyImage.objects.filter(is_primary=True).order_by('property_id', 'created_at', 'id').values_list('id', 'property_id'):
+        if property_id in seen:
+            duplicates.append(image_id)
+        seen.add(property_id)
+    PropertyImage.objects.filter(id__in=duplicates).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0010_property_lowercase_search_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_duplicate_primary_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='propertyimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('property',), name='one_primary_image_per_property'),
+        ),
+    ]
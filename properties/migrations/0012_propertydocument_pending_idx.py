@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-15 23:07
+
+from django.db import migrations, models
+
+# Index key shared by both variants; only PostgreSQL gets the INCLUDE columns
+PENDING_INDEX_SQL = (
+    'CREATE INDEX pdoc_pending ON properties_propertydocument (created_at DESC){include} '
+    "WHERE status = 'pending'"
+)
+
+
+def create_index(apps, schema_editor):
+    """Build pdoc_pending once, as a covering index on PostgreSQL; SQLite can't store non-key columns."""
+    include = ' INCLUDE (property_id, document_type)' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(PENDING_INDEX_SQL.format(include=include))
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS pdoc_pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_one_primary_image_per_property'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='propertydocument',
+                    index=models.Index(condition=models.Q(('status', 'pending')), fields=['-created_at'], name='pdoc_pending'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_index, drop_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-15 23:28
+
+from django.db import migrations, models
+
+# Index key shared by both variants; only PostgreSQL gets the INCLUDE column
+PRIMARY_FIRST_INDEX_SQL = (
+    'CREATE INDEX pimage_primary_first_idx ON properties_propertyimage '
+    '(property_id, is_primary DESC, created_at){include}'
+)
+
+
+def create_index(apps, schema_editor):
+    """Build pimage_primary_first_idx once, as a covering index on PostgreSQL; SQLite can't store non-key columns."""
+    include = ' INCLUDE (image)' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(PRIMARY_FIRST_INDEX_SQL.format(include=include))
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS pimage_primary_first_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0012_propertydocument_pending_idx'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='propertyimage',
+                    index=models.Index(fields=['property', '-is_primary', 'created_at'], name='pimage_primary_first_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_index, drop_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-15 23:55
+
+from django.db import migrations
+
+# Columns matched by the free-text property search (icontains, i.e. UPPER(col) LIKE UPPER(%s))
+SEARCH_COLUMNS = ('title', 'address', 'city', 'state')
+
+
+def create_search_indexes(apps, schema_editor):
+    """Add trigram GIN indexes so the substring search can use an index on PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS property_{column}_trgm_idx '
+            f'ON properties_property USING gin (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS property_{column}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0013_propertyimage_primary_first_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
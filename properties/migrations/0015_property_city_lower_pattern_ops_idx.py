@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-16 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0014_property_search_trigram_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='property',
+            name='property_city_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city_lower'], name='property_city_lower_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
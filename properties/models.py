@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from users.models import User
 
@@ -65,6 +66,18 @@ class Property(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, help_text=_('Google Autocomplete Latitude'))
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, help_text=_('Google Autocomplete Longitude'))
 
+    # Lowercased copies maintained by the database, so filters avoid per-row LOWER()
+    city_lower = models.GeneratedField(
+        expression=Lower('city'),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+    )
+    property_type_lower = models.GeneratedField(
+        expression=Lower('property_type'),
+        output_field=models.CharField(max_length=20),
+        db_persist=True,
+    )
+
     # Details
     bedrooms = models.PositiveIntegerField(default=1)
     bathrooms = models.DecimalField(max_digits=3, decimal_places=1, default=1.0)
@@ -93,6 +106,11 @@ class Property(models.Model):
         verbose_name = _('Property')
         verbose_name_plural = _('Properties')
         ordering = ['-created_at']
+        indexes = [
+            # Pattern ops so PostgreSQL can serve city_lower LIKE 'x%' under a non-C collation
+            models.Index(fields=['city_lower'], name='property_city_lower_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['property_type_lower'], name='property_type_lower_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -115,6 +133,21 @@ class PropertyImage(models.Model):
         verbose_name = _('Property Image')
         verbose_name_plural = _('Property Images')
         ordering = ['-is_primary', 'created_at']
+        indexes = [
+            # Serves the primary-or-first image lookup used by property listings; on
+            # PostgreSQL migration 0013 builds it with image as an INCLUDE column
+            models.Index(
+                fields=['property', '-is_primary', 'created_at'],
+                name='pimage_primary_first_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['property'],
+                condition=models.Q(is_primary=True),
+                name='one_primary_image_per_property',
+            ),
+        ]
 
     def __str__(self):
         return f"Image for {self.property.title}"
@@ -164,6 +197,15 @@ class PropertyDocument(models.Model):
         verbose_name = _('Property Document')
         verbose_name_plural = _('Property Documents')
         ordering = ['-created_at']
+        indexes = [
+            # Covers the admin pending-documents list (newest first); on PostgreSQL
+            # migration 0012 builds it with property and document_type as INCLUDE columns
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(status='pending'),
+                name='pdoc_pending',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_document_type_display()} for {self.property.title}"
@@ -201,6 +243,14 @@ class DocumentFeedback(models.Model):
         verbose_name = _('Document Feedback')
         verbose_name_plural = _('Document Feedback')
         ordering = ['created_at']  # Chronological order
+        indexes = [
+            # Only unread messages are looked up by document and sender
+            models.Index(
+                fields=['document', 'sender_type'],
+                condition=models.Q(is_read=False),
+                name='docfeedback_unread_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Feedback on {self.document} by {self.user.username}"
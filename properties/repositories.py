@@ -1,9 +1,24 @@
-from typing import Optional, List
-from django.db.models import Q
+from typing import Optional, List, Dict, Any, Tuple
+from django.db import transaction
+from django.db.models import Q, Count, OuterRef, Prefetch, Subquery, Value, Window
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from .models import Property, PropertyImage, PropertyDocument, DocumentFeedback
 from users.models import User
 import logging
 
+logger = logging.getLogger('house_rental')
+
+# Shorter text queries are ignored rather than scanning every row with ILIKE
+MIN_SEARCH_QUERY_LENGTH = 3
+
+# Columns needed to render a property card (PropertySummarySchema)
+PROPERTY_SUMMARY_FIELDS = (
+    'id', 'title', 'property_type', 'status', 'document_verification_status',
+    'owner_id', 'owner__username', 'owner__first_name', 'owner__last_name',
+    'address', 'city', 'state', 'country',
+    'bedrooms', 'bathrooms', 'price_per_night', 'created_at',
+)
+
 class PropertyRepository:
     """
     Repository for Property model operations.
@@ -20,82 +35,89 @@ class PropertyRepository:
     @staticmethod
     def get_property_by_id(property_id: int) -> Optional[Property]:
         """
-        Get a property by ID.
+        Get a property by ID, with its owner.
         """
         try:
-            return Property.objects.get(id=property_id)
+            return Property.objects.select_related('owner').get(id=property_id)
         except Property.DoesNotExist:
             return None
 
     @staticmethod
-    def get_properties_by_owner(owner: User) -> List[Property]:
+    def _primary_image_subquery() -> Subquery:
         """
-        Get properties by owner with prefetched images.
+        Subquery selecting the primary image file of the outer property,
+        falling back to its oldest image (same ordering as PropertyImage.Meta,
+        served by the pimage_primary_first_idx index).
         """
-        properties = Property.objects.filter(owner=owner).prefetch_related('images')
-
-        # Attach prefetched images to each property for easy access
-        for prop in properties:
-            prop.prefetched_images = list(prop.images.all())
-
-        return properties
+        return Subquery(
+            PropertyImage.objects.filter(property=OuterRef('pk'))
+            .order_by('-is_primary', 'created_at').values('image')[:1]
+        )
 
     @staticmethod
-    def get_properties_by_status(status: str) -> List[Property]:
+    def _with_images(queryset, include_images: bool = False):
         """
-        Get properties by status with prefetched images.
+        Annotate properties with their primary image file name (`primary_image`) and,
+        only when requested, attach all of their images as `prefetched_images`.
+        The owner is joined in since every property summary includes it.
         """
-        properties = Property.objects.filter(status=status).prefetch_related('images')
-
-        # Attach prefetched images to each property for easy access
-        for prop in properties:
-            prop.prefetched_images = list(prop.images.all())
-
-        return properties
+        queryset = queryset.select_related('owner').annotate(primary_image=PropertyRepository._primary_image_subquery())
+        if include_images:
+            queryset = queryset.prefetch_related(Prefetch('images', to_attr='prefetched_images'))
+        return queryset
 
     @staticmethod
-    def get_available_properties() -> List[Property]:
+    def get_properties_by_owner(owner: User, include_images: bool = False) -> List[Property]:
         """
-        Get all available properties (approved and not rented) with prefetched images.
+        Get properties by owner with their primary image annotated.
         """
-        properties = Property.objects.filter(status=Property.PropertyStatus.APPROVED).prefetch_related('images')
+        return PropertyRepository._with_images(Property.objects.filter(owner=owner), include_images)
 
-        # Attach prefetched images to each property for easy access
-        for prop in properties:
-            prop.prefetched_images = list(prop.images.all())
+    @staticmethod
+    def get_properties_by_status(status: str, include_images: bool = False) -> List[Property]:
+        """
+        Get properties by status with their primary image annotated.
+        """
+        return PropertyRepository._with_images(Property.objects.filter(status=status), include_images)
 
-        return properties
+    @staticmethod
+    def get_available_properties(include_images: bool = False) -> List[Property]:
+        """
+        Get all available properties (approved and not rented) with their primary image annotated.
+        """
+        return PropertyRepository._with_images(
+            Property.objects.filter(status=Property.PropertyStatus.APPROVED), include_images
+        )
 
     @staticmethod
-    def search_properties(query: str = None, city: str = None, property_type: str = None,
-                          min_price: float = None, max_price: float = None, price_range: str = None,
-                          bedrooms: int = None, bathrooms: float = None,
-                          status: str = None, include_all_statuses: bool = False,
-                          owner: User = None,
-                          page: int = 1, page_size: int = 10) -> List[Property]:
+    def _build_search_filters(query: str = None, city: str = None, property_type: str = None,
+                              min_price: float = None, max_price: float = None, price_range: str = None,
+                              bedrooms: int = None, bathrooms: float = None,
+                              status: str = None, include_all_statuses: bool = False,
+                              owner: User = None) -> Tuple[Q, Dict[str, Any]]:
         """
-        Search properties with various filters and pagination.
+        Build the filters shared by the search and count queries.
+        Returns a (Q, kwargs) pair to be used as Property.objects.filter(q, **kwargs);
+        the Q object is only populated for the multi-field text search.
         """
-        # Start with an empty filter
-        filters = Q()
-        
-        # Debug logs
-        logger = logging.getLogger('house_rental')
-        logger.info(f"Search params - city: {city}, property_type: {property_type}")
+        filters = {}
+        text_filter = Q()
 
         # Apply status filter
         if not include_all_statuses:
             # Default to approved properties only
-            if status:
-                filters &= Q(status=status)
-            else:
-                filters &= Q(status=Property.PropertyStatus.APPROVED)
+            filters['status'] = status or Property.PropertyStatus.APPROVED
         elif status:
             # If include_all_statuses is True but a specific status is requested
-            filters &= Q(status=status)
-
-        if query:
-            filters &= (
+            filters['status'] = status
+
+        query = query.strip() if query else query
+        if query and query.isdigit() and int(query) < 2 ** 31:
+            # A purely numeric query is treated as a property ID lookup
+            filters['pk'] = int(query)
+        elif query and len(query) >= MIN_SEARCH_QUERY_LENGTH:
+            # On PostgreSQL each column has a trigram index on UPPER(col), which icontains uses
+            text_filter = (
                 Q(title__icontains=query) |
                 Q(address__icontains=query) |
                 Q(city__icontains=query) |
@@ -103,16 +125,12 @@ class PropertyRepository:
             )
 
         if city:
-            filters &= Q(city__icontains=city)
-            logger.info(f"Added city filter: {city}")
+            # Match against the indexed lowercase column so a prefix scan can be used
+            filters['city_lower__startswith'] = city.lower()
 
         if property_type:
             # Handle property type filtering - allow case-insensitive matching
-            logger.info(f"Adding property_type filter: {property_type}")
-            filters &= Q(property_type__iexact=property_type)
-            
-        # Log the final filter
-        logger.info(f"Final filters: {filters}")
+            filters['property_type_lower'] = property_type.lower()
 
         # Handle price filtering
         if price_range:
@@ -123,49 +141,157 @@ class PropertyRepository:
 
                 # Set min price if it's a number
                 if min_val.isdigit():
-                    min_price_val = float(min_val)
-                    filters &= Q(price_per_night__gte=min_price_val)
+                    filters['price_per_night__gte'] = float(min_val)
 
                 # Set max price if it's a number and not "any"
                 if max_val.isdigit():
-                    max_price_val = float(max_val)
-                    filters &= Q(price_per_night__lte=max_price_val)
+                    filters['price_per_night__lte'] = float(max_val)
         else:
             # Use traditional min_price and max_price if price_range is not provided
             if min_price is not None:
-                filters &= Q(price_per_night__gte=min_price)
+                filters['price_per_night__gte'] = min_price
 
             if max_price is not None:
-                filters &= Q(price_per_night__lte=max_price)
+                filters['price_per_night__lte'] = max_price
 
         # Handle bedrooms filtering (supports "X+" format from frontend)
         if bedrooms is not None:
             # Special case for 5+ bedrooms
             if int(bedrooms) == 5:
-                filters &= Q(bedrooms__gte=bedrooms)
+                filters['bedrooms__gte'] = bedrooms
             else:
                 # Exact match for 1, 2, 3, 4 bedrooms
-                filters &= Q(bedrooms=bedrooms)
+                filters['bedrooms'] = bedrooms
 
         if bathrooms is not None:
-            filters &= Q(bathrooms__gte=bathrooms)
+            filters['bathrooms__gte'] = bathrooms
 
         # Filter by owner if provided
         if owner is not None:
-            filters &= Q(owner=owner)
+            filters['owner'] = owner
+
+        return text_filter, filters
+
+    @staticmethod
+    def search_properties(query: str = None, city: str = None, property_type: str = None,
+                          min_price: float = None, max_price: float = None, price_range: str = None,
+                          bedrooms: int = None, bathrooms: float = None,
+                          status: str = None, include_all_statuses: bool = False,
+                          owner: User = None,
+                          page: int = 1, page_size: int = 10, include_images: bool = False) -> List[Property]:
+        """
+        Search properties with various filters and pagination.
+        """
+        text_filter, filters = PropertyRepository._build_search_filters(
+            query=query, city=city, property_type=property_type,
+            min_price=min_price, max_price=max_price, price_range=price_range,
+            bedrooms=bedrooms, bathrooms=bathrooms,
+            status=status, include_all_statuses=include_all_statuses,
+            owner=owner
+        )
+
+        # Only render the filters when debug logging is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final filters: %s %s", text_filter, filters)
+
+        # Calculate pagination offsets
+        offset = (page - 1) * page_size
+        limit = page_size
+
+        # Get properties with their primary image and apply pagination
+        queryset = Property.objects.filter(text_filter, **filters)
+        return PropertyRepository._with_images(queryset, include_images)[offset:offset+limit]
+
+    @staticmethod
+    def search_properties_values(query: str = None, city: str = None, property_type: str = None,
+                                 min_price: float = None, max_price: float = None, price_range: str = None,
+                                 bedrooms: int = None, bathrooms: float = None,
+                                 status: str = None, include_all_statuses: bool = False,
+                                 owner: User = None,
+                                 page: int = 1, page_size: int = 10) -> List[dict]:
+        """
+        Search properties and return plain summary rows instead of model instances.
+
+        Owner fields are inlined through the join and the primary image (falling back
+        to the first image) is resolved with a subquery, so no follow-up queries are needed.
+        """
+        text_filter, filters = PropertyRepository._build_search_filters(
+            query=query, city=city, property_type=property_type,
+            min_price=min_price, max_price=max_price, price_range=price_range,
+            bedrooms=bedrooms, bathrooms=bathrooms,
+            status=status, include_all_statuses=include_all_statuses,
+            owner=owner
+        )
+
+        # Calculate pagination offsets
+        offset = (page - 1) * page_size
+        limit = page_size
+
+        return list(
+            Property.objects.filter(text_filter, **filters)
+            .annotate(primary_image=PropertyRepository._primary_image_subquery())
+            .values(*PROPERTY_SUMMARY_FIELDS, 'primary_image')[offset:offset+limit]
+        )
+
+    @staticmethod
+    def search_properties_with_count(query: str = None, city: str = None, property_type: str = None,
+                                     min_price: float = None, max_price: float = None, price_range: str = None,
+                                     bedrooms: int = None, bathrooms: float = None,
+                                     status: str = None, include_all_statuses: bool = False,
+                                     owner: User = None,
+                                     page: int = 1, page_size: int = 10) -> Tuple[List[dict], Optional[int]]:
+        """
+        Search properties like search_properties_values and also return the total
+        number of matches, computed by a COUNT(*) OVER () window in the same query.
+
+        The total is None when the page is past the end, since no row carries it.
+        """
+        text_filter, filters = PropertyRepository._build_search_filters(
+            query=query, city=city, property_type=property_type,
+            min_price=min_price, max_price=max_price, price_range=price_range,
+            bedrooms=bedrooms, bathrooms=bathrooms,
+            status=status, include_all_statuses=include_all_statuses,
+            owner=owner
+        )
 
         # Calculate pagination offsets
         offset = (page - 1) * page_size
         limit = page_size
 
-        # Get properties with prefetched images and apply pagination
-        properties = Property.objects.filter(filters).prefetch_related('images')[offset:offset+limit]
+        rows = list(
+            Property.objects.filter(text_filter, **filters)
+            .annotate(
+                primary_image=PropertyRepository._primary_image_subquery(),
+                total_count=Window(Count('id'))
+            )
+            .values(*PROPERTY_SUMMARY_FIELDS, 'primary_image', 'total_count')[offset:offset+limit]
+        )
 
-        # Attach prefetched images to each property for easy access
-        for prop in properties:
-            prop.prefetched_images = list(prop.images.all())
+        total = None
+        for row in rows:
+            total = row.pop('total_count')
+        return rows, total
 
-        return properties
+    @staticmethod
+    def get_properties_by_owner_values(owner: User) -> List[dict]:
+        """
+        Get summary rows for every property of an owner, with the primary image resolved.
+        """
+        return list(
+            Property.objects.filter(owner=owner)
+            .annotate(primary_image=PropertyRepository._primary_image_subquery())
+            .values(*PROPERTY_SUMMARY_FIELDS, 'primary_image')
+        )
+
+    @staticmethod
+    def get_images_values(property_ids: List[int]) -> List[dict]:
+        """
+        Get image rows for several properties in a single query.
+        """
+        return list(
+            PropertyImage.objects.filter(property_id__in=property_ids)
+            .values('id', 'property_id', 'image', 'caption', 'is_primary')
+        )
 
     @staticmethod
     def count_properties(query: str = None, city: str = None, property_type: str = None,
@@ -176,75 +302,15 @@ class PropertyRepository:
         """
         Count properties matching the search criteria.
         """
-        # Start with an empty filter
-        filters = Q()
-
-        # Apply status filter
-        if not include_all_statuses:
-            # Default to approved properties only
-            if status:
-                filters &= Q(status=status)
-            else:
-                filters &= Q(status=Property.PropertyStatus.APPROVED)
-        elif status:
-            # If include_all_statuses is True but a specific status is requested
-            filters &= Q(status=status)
-
-        if query:
-            filters &= (
-                Q(title__icontains=query) |
-                Q(address__icontains=query) |
-                Q(city__icontains=query) |
-                Q(state__icontains=query)
-            )
-
-        if city:
-            filters &= Q(city__icontains=city)
-
-        if property_type:
-            # Handle property type filtering - allow case-insensitive matching
-            filters &= Q(property_type__iexact=property_type)
-
-        # Handle price filtering
-        if price_range:
-            # Parse price range in format "min-max" (e.g., "0-100", "100-200", "1000-any")
-            price_parts = price_range.split('-')
-            if len(price_parts) == 2:
-                min_val, max_val = price_parts
-
-                # Set min price if it's a number
-                if min_val.isdigit():
-                    min_price_val = float(min_val)
-                    filters &= Q(price_per_night__gte=min_price_val)
-
-                # Set max price if it's a number and not "any"
-                if max_val.isdigit():
-                    max_price_val = float(max_val)
-                    filters &= Q(price_per_night__lte=max_price_val)
-        else:
-            # Use traditional min_price and max_price if price_range is not provided
-            if min_price is not None:
-                filters &= Q(price_per_night__gte=min_price)
-
-            if max_price is not None:
-                filters &= Q(price_per_night__lte=max_price)
-
-        if bedrooms is not None:
-            # Special case for 5+ bedrooms
-            if int(bedrooms) == 5:
-                filters &= Q(bedrooms__gte=bedrooms)
-            else:
-                # Exact match for 1, 2, 3, 4 bedrooms
-                filters &= Q(bedrooms=bedrooms)
-
-        if bathrooms is not None:
-            filters &= Q(bathrooms__gte=bathrooms)
-
-        # Filter by owner if provided
-        if owner is not None:
-            filters &= Q(owner=owner)
+        text_filter, filters = PropertyRepository._build_search_filters(
+            query=query, city=city, property_type=property_type,
+            min_price=min_price, max_price=max_price, price_range=price_range,
+            bedrooms=bedrooms, bathrooms=bathrooms,
+            status=status, include_all_statuses=include_all_statuses,
+            owner=owner
+        )
 
-        return Property.objects.filter(filters).count()
+        return Property.objects.filter(text_filter, **filters).count()
 
     @staticmethod
     def update_property(property_obj: Property, **kwargs) -> Property:
@@ -254,7 +320,8 @@ class PropertyRepository:
         for key, value in kwargs.items():
             setattr(property_obj, key, value)
 
-        property_obj.save()
+        # Only write the columns that were changed (auto_now fields must be listed explicitly)
+        property_obj.save(update_fields=[*kwargs, 'updated_at'])
         return property_obj
 
     @staticmethod
@@ -270,23 +337,52 @@ class PropertyRepository:
         """
         Add an image to a property.
         """
-        # If this is the primary image, set all other images to non-primary
-        if is_primary:
-            PropertyImage.objects.filter(property=property_obj, is_primary=True).update(is_primary=False)
+        with transaction.atomic():
+            # If this is the primary image, set all other images to non-primary
+            if is_primary:
+                PropertyImage.objects.filter(property=property_obj, is_primary=True).update(is_primary=False)
 
-        return PropertyImage.objects.create(
-            property=property_obj,
-            image=image,
-            caption=caption,
-            is_primary=is_primary
-        )
+            return PropertyImage.objects.create(
+                property=property_obj,
+                image=image,
+                caption=caption,
+                is_primary=is_primary
+            )
+
+    @staticmethod
+    def bulk_add_property_images(property_obj: Property, images: List[Dict[str, Any]]) -> List[PropertyImage]:
+        """
+        Add several images to a property with batched INSERTs.
+        Each item is a dict with 'image' and optional 'caption' / 'is_primary' keys;
+        only the first item flagged as primary is kept as the primary image.
+        """
+        image_objs = []
+        has_primary = False
+        for item in images:
+            is_primary = bool(item.get('is_primary')) and not has_primary
+            has_primary = has_primary or is_primary
+            image_objs.append(PropertyImage(
+                property=property_obj,
+                image=item['image'],
+                caption=item.get('caption'),
+                is_primary=is_primary
+            ))
+
+        with transaction.atomic():
+            if has_primary:
+                PropertyImage.objects.filter(property=property_obj, is_primary=True).update(is_primary=False)
+
+            return PropertyImage.objects.bulk_create(image_objs, batch_size=100)
 
     @staticmethod
     def get_property_images(property_obj: Property) -> List[PropertyImage]:
         """
-        Get all images for a property.
+        Get all images for a property, primary image first.
+        Only the columns shown in property details are loaded.
         """
-        return PropertyImage.objects.filter(property=property_obj)
+        return PropertyImage.objects.filter(property=property_obj).only(
+            'id', 'image', 'caption', 'is_primary'
+        ).order_by('-is_primary', 'created_at')
 
     @staticmethod
     def add_property_document(property_obj: Property, document, document_type: str, description: str = None) -> PropertyDocument:
@@ -308,6 +404,25 @@ class PropertyRepository:
         """
         return PropertyDocument.objects.filter(property=property_obj)
 
+    @staticmethod
+    def _feedback_thread_prefetch() -> Prefetch:
+        """
+        Prefetch for document feedback threads, oldest message first, with senders.
+        """
+        return Prefetch(
+            'feedback_thread',
+            queryset=DocumentFeedback.objects.select_related('user').order_by('created_at')
+        )
+
+    @staticmethod
+    def get_property_documents_with_feedback(property_obj: Property) -> List[PropertyDocument]:
+        """
+        Get all documents for a property with their feedback threads prefetched.
+        """
+        return PropertyDocument.objects.filter(property=property_obj).prefetch_related(
+            PropertyRepository._feedback_thread_prefetch()
+        )
+
     @staticmethod
     def get_document_by_id(document_id: int) -> Optional[PropertyDocument]:
         """
@@ -323,12 +438,15 @@ class PropertyRepository:
         """
         Update the status of a document.
         """
+        update_fields = ['status', 'updated_at']
         document_obj.status = status
         if rejection_reason:
             document_obj.rejection_reason = rejection_reason
+            update_fields.append('rejection_reason')
         if feedback:
             document_obj.feedback = feedback
-        document_obj.save()
+            update_fields.append('feedback')
+        document_obj.save(update_fields=update_fields)
         return document_obj
 
     @staticmethod
@@ -338,7 +456,7 @@ class PropertyRepository:
         """
         document_obj.feedback = feedback
         document_obj.feedback_read = False  # Reset feedback_read flag when new feedback is added
-        document_obj.save()
+        document_obj.save(update_fields=['feedback', 'feedback_read', 'updated_at'])
         return document_obj
 
     @staticmethod
@@ -347,17 +465,23 @@ class PropertyRepository:
         Mark document feedback as read.
         """
         document_obj.feedback_read = True
-        document_obj.save()
+        document_obj.save(update_fields=['feedback_read', 'updated_at'])
         return document_obj
 
     @staticmethod
     def get_pending_documents() -> List[PropertyDocument]:
         """
         Get all pending documents with related property and owner information.
+        The owner's display name is built in SQL as `owner_name`.
         """
+        owner_full_name = Trim(Concat('property__owner__first_name', Value(' '), 'property__owner__last_name'))
         return PropertyDocument.objects.filter(
             status=PropertyDocument.DocumentStatus.PENDING
-        ).select_related('property', 'property__owner')
+        ).select_related('property', 'property__owner').annotate(
+            owner_name=Coalesce(NullIf(owner_full_name, Value('')), 'property__owner__username')
+        ).prefetch_related(
+            PropertyRepository._feedback_thread_prefetch()
+        ).order_by('-created_at')
 
     @staticmethod
     def update_property_document_verification_status(property_obj: Property, status: str) -> Property:
@@ -365,7 +489,7 @@ class PropertyRepository:
         Update the document verification status of a property.
         """
         property_obj.document_verification_status = status
-        property_obj.save()
+        property_obj.save(update_fields=['document_verification_status', 'updated_at'])
         return property_obj
 
     # Document Feedback methods
@@ -396,9 +520,17 @@ class PropertyRepository:
         If user_type is 'admin', mark all landlord messages as read.
         If user_type is 'landlord', mark all admin messages as read.
         """
+        return PropertyRepository.mark_feedback_threads_as_read([document_obj.id], user_type)
+
+    @staticmethod
+    def mark_feedback_threads_as_read(document_ids: List[int], user_type: str) -> bool:
+        """
+        Mark the feedback threads of several documents as read with a single UPDATE.
+        Uses the same recipient rules as mark_feedback_thread_as_read.
+        """
         recipient_type = 'admin' if user_type == 'landlord' else 'landlord'
         DocumentFeedback.objects.filter(
-            document=document_obj,
+            document_id__in=document_ids,
             sender_type=recipient_type,
             is_read=False
         ).update(is_read=True)
@@ -409,9 +541,22 @@ class PropertyRepository:
         """
         Get count of unread feedback messages for a specific recipient type.
         """
+        counts = PropertyRepository.get_unread_feedback_counts([document_obj.id], user_type)
+        return counts[document_obj.id]
+
+    @staticmethod
+    def get_unread_feedback_counts(document_ids: List[int], user_type: str) -> Dict[int, int]:
+        """
+        Get unread feedback counts for several documents in a single grouped query.
+        Documents without unread messages are reported with a count of 0.
+        """
         recipient_type = 'admin' if user_type == 'landlord' else 'landlord'
-        return DocumentFeedback.objects.filter(
-            document=document_obj,
+        rows = DocumentFeedback.objects.filter(
+            document_id__in=document_ids,
             sender_type=recipient_type,
             is_read=False
-        ).count()
\ No newline at end of file
+        ).values('document_id').annotate(count=Count('id')).order_by()
+
+        counts = dict.fromkeys(document_ids, 0)
+        counts.update({row['document_id']: row['count'] for row in rows})
+        return counts
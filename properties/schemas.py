@@ -1,6 +1,6 @@
 from typing import List, Dict, Any, Optional
 from ninja import Schema
-from pydantic import Field, condecimal
+from pydantic import ConfigDict, Field, computed_field, condecimal
 from decimal import Decimal
 from enum import Enum
 
@@ -80,14 +80,55 @@ class PropertyImageSchema(Schema):
     caption: Optional[str] = None
     is_primary: bool = False
 
+class PropertyOwnerSchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+    @computed_field
+    @property
+    def name(self) -> str:
+        return f"{self.first_name or ''} {self.last_name or ''}".strip() or self.username
+
+class PropertyAmenitiesSchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    wifi: bool = False
+    kitchen: bool = False
+    air_conditioning: bool = False
+    heating: bool = False
+    tv: bool = False
+    parking: bool = False
+    pool: bool = False
+    gym: bool = False
+
+class PropertyAdditionalServicesSchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    maid_service: bool = False
+    car_rental: bool = False
+
+class PropertyImageItemSchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    id: int
+    url: str
+    caption: Optional[str] = None
+    is_primary: bool = False
+
 class PropertyDetailSchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     id: int
     title: str
     description: str
     property_type: str
     status: str
     document_verification_status: Optional[str] = 'not_submitted'
-    owner: Dict[str, Any]
+    owner: PropertyOwnerSchema
     address: str
     city: str
     state: str
@@ -99,20 +140,22 @@ class PropertyDetailSchema(Schema):
     bathrooms: Decimal
     area: int
     price_per_night: Decimal
-    amenities: Dict[str, bool]
-    additional_services: Dict[str, bool]
-    images: List[Dict[str, Any]]
+    amenities: PropertyAmenitiesSchema
+    additional_services: PropertyAdditionalServicesSchema
+    images: List[PropertyImageItemSchema]
     documents: Optional[List[Dict[str, Any]]] = None
     created_at: Any
     updated_at: Any
 
 class PropertySummarySchema(Schema):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     id: int
     title: str
     property_type: str
     status: str
     document_verification_status: Optional[str] = 'not_submitted'
-    owner: Dict[str, Any]
+    owner: PropertyOwnerSchema
     address: str
     city: str
     state: str
@@ -121,7 +164,7 @@ class PropertySummarySchema(Schema):
     bathrooms: Decimal
     price_per_night: Decimal
     primary_image: Optional[str] = None
-    images: Optional[List[Dict[str, Any]]] = None
+    images: Optional[List[PropertyImageItemSchema]] = None
     created_at: Any
 
 # Property document schemas
@@ -190,11 +233,13 @@ class PropertyDocumentSummarySchema(Schema):
     rejection_reason: Optional[str] = None
     feedback: Optional[str] = None
     feedback_read: Optional[bool] = False
+    unread_feedback_count: int = 0
     created_at: Any
     updated_at: Optional[Any] = None
 
 # Paginated response schemas
 class PaginatedPropertyResponse(PaginatedResponse):
+    has_next: Optional[bool] = None
     results: List[PropertySummarySchema]
 
 class PaginatedDocumentResponse(PaginatedResponse):
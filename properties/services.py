@@ -1,7 +1,16 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
+from decimal import Decimal
+import hashlib
 import logging
+import math
+import operator
+import random
+import threading
+import time
+from cachetools import TTLCache
 from django.core.cache import cache
 from django.conf import settings
+from django.db import models
 
 from .repositories import PropertyRepository
 from .models import Property, PropertyImage, PropertyDocument
@@ -12,6 +21,68 @@ logger = logging.getLogger('house_rental')
 # Cache timeout in seconds (10 minutes)
 CACHE_TIMEOUT = 60 * 10
 
+# Listing and count results are short-lived since any property change can move them
+LISTING_CACHE_TIMEOUT = 120
+COUNT_CACHE_TIMEOUT = 60
+
+# Per-property image lists are only invalidated by that property's version
+IMAGES_CACHE_TIMEOUT = 300
+
+# In-process tier in front of the shared cache for property details, keyed by
+# (property_id, version) so a version bump makes old entries unreachable at once
+_details_l1 = TTLCache(maxsize=1024, ttl=60)
+_details_l1_lock = threading.Lock()
+
+# Only one request rebuilds a missing property details entry; the others wait for it
+DETAILS_LOCK_TIMEOUT = 5
+DETAILS_LOCK_WAIT = 1.0
+DETAILS_LOCK_POLL_INTERVAL = 0.05
+
+# Storage backing PropertyImage.image and PropertyDocument.document, used to turn
+# stored file names into URLs without building a FieldFile per row
+_image_storage = PropertyImage._meta.get_field('image').storage
+_document_storage = PropertyDocument._meta.get_field('document').storage
+
+# Model fields copied unchanged into property details
+_DETAIL_FIELDS = (
+    'id', 'title', 'description', 'property_type', 'status', 'address', 'city', 'state',
+    'country', 'zip_code', 'latitude', 'longitude', 'bedrooms', 'bathrooms', 'area',
+    'price_per_night', 'created_at', 'updated_at',
+)
+_OWNER_FIELDS = ('id', 'username', 'first_name', 'last_name')
+_AMENITY_KEYS = ('wifi', 'kitchen', 'air_conditioning', 'heating', 'tv', 'parking', 'pool', 'gym')
+_SERVICE_KEYS = ('maid_service', 'car_rental')
+
+# Pending documents are read from the database in chunks of this size
+PENDING_DOCUMENTS_CHUNK_SIZE = 100
+
+# Decimal columns and their stored precision, used to match saved values to what the database returns
+_DECIMAL_QUANTS = {
+    field.attname: Decimal(1).scaleb(-field.decimal_places)
+    for field in Property._meta.concrete_fields
+    if isinstance(field, models.DecimalField)
+}
+
+# Choice values bound once at import for the permission and status checks below
+_ROLE_ADMIN = User.Role.ADMIN
+_DOC_NOT_SUBMITTED = Property.DocumentVerificationStatus.NOT_SUBMITTED
+_DOC_PENDING = Property.DocumentVerificationStatus.PENDING
+
+# Roles allowed to create property listings
+_CREATOR_ROLES = frozenset({User.Role.AGENT, _ROLE_ADMIN})
+
+# Property verification status that follows from a reviewed document's status
+_VERIFICATION_STATUS_FOR_DOCUMENT = {
+    PropertyDocument.DocumentStatus.APPROVED: Property.DocumentVerificationStatus.VERIFIED,
+    PropertyDocument.DocumentStatus.REJECTED: Property.DocumentVerificationStatus.REJECTED,
+}
+
+# Getters built once so each property is read with a single call per group
+_get_detail_fields = operator.attrgetter(*_DETAIL_FIELDS)
+_get_owner_fields = operator.attrgetter(*_OWNER_FIELDS)
+_get_amenities = operator.attrgetter(*(f'has_{key}' for key in _AMENITY_KEYS))
+_get_services = operator.attrgetter(*(f'has_{key}' for key in _SERVICE_KEYS))
+
 class PropertyService:
     """
     Service for property-related business logic.
@@ -20,100 +91,211 @@ class PropertyService:
     def __init__(self, property_repository: PropertyRepository = None):
         self.property_repository = property_repository or PropertyRepository()
 
-    def _invalidate_property_cache(self, property_id: int):
+    def _cache_version(self, version_key: str) -> int:
+        """
+        Get the current version stored under a cache version key.
+        """
+        # Versions never expire; a fresh one starts from the clock so an evicted
+        # version cannot come back with a number that has already been used
+        return cache.get_or_set(version_key, lambda: int(time.time()), None)
+
+    def _bump_cache_version(self, version_key: str):
+        """
+        Move a cache version forward, orphaning every key built from the old one.
+        """
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, int(time.time()), None)
+
+    def _property_version(self, property_id: int) -> int:
+        """
+        Get the cache version for a property.
+        """
+        return self._cache_version(f"ver:property:{property_id}")
+
+    def _property_versions(self, property_ids: List[int]) -> Dict[int, int]:
         """
-        Invalidate cache for a property.
+        Get the cache versions for several properties with one cache round trip.
+        """
+        keys = {property_id: f"ver:property:{property_id}" for property_id in property_ids}
+        found = cache.get_many(keys.values())
+        return {
+            property_id: found[key] if key in found else self._cache_version(key)
+            for property_id, key in keys.items()
+        }
+
+    def _listing_cache_key(self, kind: str, owner: Optional[User], **params) -> str:
+        """
+        Build a versioned cache key for a listing or count query.
+        """
+        owner_id = owner.id if owner else 'all'
+        version = self._cache_version(f"ver:property_list:{owner_id}")
+        digest = hashlib.blake2b(repr(sorted(params.items())).encode(), digest_size=8).hexdigest()
+        return f"v{version}:{kind}:{owner_id}:{digest}"
+
+    def _invalidate_property_list_cache(self, owner_id: int):
+        """
+        Invalidate cached listings for an owner and the public search.
+        """
+        self._bump_cache_version(f"ver:property_list:{owner_id}")
+        self._bump_cache_version("ver:property_list:all")
+
+    def _invalidate_property_cache(self, property_id: int, owner_id: int = None):
         """
-        cache_key = f"property_details:{property_id}"
-        cache.delete(cache_key)
+        Invalidate cache for a property, and the listings it appears in when the owner is given.
+        """
+        self._bump_cache_version(f"ver:property:{property_id}")
+        if owner_id is not None:
+            self._invalidate_property_list_cache(owner_id)
         logger.debug(f"Cache invalidated for property: {property_id}")
 
+    def _assert_owner_or_admin(self, property_obj: Property, user: User, message: str):
+        """
+        Raise ValueError with the given message unless the user owns the property or is an admin.
+        """
+        if property_obj.owner_id != user.id and user.role != _ROLE_ADMIN:
+            raise ValueError(message)
+
     def create_property(self, owner: User, **property_data) -> Property:
         """
         Create a new property listing.
         """
         # Validate owner is an agent
-        if owner.role != User.Role.AGENT and owner.role != User.Role.ADMIN:
+        if owner.role not in _CREATOR_ROLES:
             raise ValueError("Only agents and admins can create property listings")
 
         # Create the property
-        return self.property_repository.create_property(owner=owner, **property_data)
+        property_obj = self.property_repository.create_property(owner=owner, **property_data)
+
+        # Start a fresh details version and invalidate the owner's listings
+        self._invalidate_property_cache(property_obj.id, owner.id)
+
+        return property_obj
 
     def get_property_details(self, property_id: int) -> Optional[Dict[str, Any]]:
         """
         Get detailed property information with caching.
+
+        Details are read from a short-lived in-process cache first, then from the
+        shared cache. The returned dict may be shared between requests and must
+        not be modified.
         """
-        # Try to get from cache first
-        cache_key = f"property_details:{property_id}"
+        version = self._property_version(property_id)
+        l1_key = (property_id, version)
+        with _details_l1_lock:
+            property_data = _details_l1.get(l1_key)
+        if property_data is not None:
+            return property_data
+
+        property_data = self._get_shared_property_details(
+            property_id, f"v{version}:property_details:{property_id}"
+        )
+        if property_data is not None:
+            with _details_l1_lock:
+                _details_l1[l1_key] = property_data
+        return property_data
+
+    def _get_shared_property_details(self, property_id: int, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get property details from the shared cache, rebuilding them on a miss.
+
+        A single request holds a short lock while rebuilding the entry so a cache
+        miss does not send every concurrent request to the database.
+        """
+        lock_key = f"lock:{cache_key}"
         cached_data = cache.get(cache_key)
 
         if cached_data:
-            logger.debug(f"Cache hit for property details: {property_id}")
-            return cached_data
+            property_data, expires_at, delta = cached_data
+            # Refresh early with a probability that grows as expiry approaches
+            if time.time() - delta * math.log(1.0 - random.random()) < expires_at:
+                logger.debug(f"Cache hit for property details: {property_id}")
+                return property_data
+            if not cache.add(lock_key, 1, DETAILS_LOCK_TIMEOUT):
+                # Another request is already refreshing this entry
+                return property_data
+            logger.debug(f"Early refresh for property details: {property_id}")
+        else:
+            logger.debug(f"Cache miss for property details: {property_id}")
+            if not cache.add(lock_key, 1, DETAILS_LOCK_TIMEOUT):
+                property_data = self._wait_for_property_details(cache_key)
+                if property_data is not None:
+                    return property_data
+                # The lock holder did not finish in time, so load it directly
+                return self._load_property_details(property_id, cache_key)
+
+        try:
+            return self._load_property_details(property_id, cache_key)
+        finally:
+            cache.delete(lock_key)
 
-        logger.debug(f"Cache miss for property details: {property_id}")
+    def _wait_for_property_details(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Poll the cache while another request rebuilds a property details entry.
+        """
+        deadline = time.monotonic() + DETAILS_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(DETAILS_LOCK_POLL_INTERVAL)
+            cached_data = cache.get(cache_key)
+            if cached_data:
+                return cached_data[0]
+        return None
 
+    def _load_property_details(self, property_id: int, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load property details from the database and cache them.
+        """
         property_obj = self.property_repository.get_property_by_id(property_id)
         if not property_obj:
             return None
 
+        return self._cache_property_details(property_obj, cache_key)
+
+    def get_property_details_for(self, property_obj: Property) -> Dict[str, Any]:
+        """
+        Get property details for a property the caller has already loaded, such as one
+        just created or updated, without fetching it again. The result is cached.
+        """
+        # Values assigned in Python keep their input precision until reloaded
+        for attname, quant in _DECIMAL_QUANTS.items():
+            value = getattr(property_obj, attname)
+            if value is not None:
+                setattr(property_obj, attname, Decimal(str(value)).quantize(quant))
+
+        cache_key = f"v{self._property_version(property_obj.id)}:property_details:{property_obj.id}"
+        return self._cache_property_details(property_obj, cache_key)
+
+    def _cache_property_details(self, property_obj: Property, cache_key: str) -> Dict[str, Any]:
+        """
+        Format property details and cache them.
+        """
+        started = time.monotonic()
+
         # Get property images
         images = self.property_repository.get_property_images(property_obj)
 
         # Format property data
-        property_data = {
-            'id': property_obj.id,
-            'title': property_obj.title,
-            'description': property_obj.description,
-            'property_type': property_obj.property_type,
-            'status': property_obj.status,
+        property_data = dict(zip(_DETAIL_FIELDS, _get_detail_fields(property_obj)))
+        property_data.update({
             'document_verification_status': property_obj.document_verification_status or 'not_submitted',
-            'owner': {
-                'id': property_obj.owner.id,
-                'username': property_obj.owner.username,
-                'first_name': property_obj.owner.first_name,
-                'last_name': property_obj.owner.last_name,
-            },
-            'address': property_obj.address,
-            'city': property_obj.city,
-            'state': property_obj.state,
-            'country': property_obj.country,
-            'zip_code': property_obj.zip_code,
-            'latitude': property_obj.latitude,
-            'longitude': property_obj.longitude,
-            'bedrooms': property_obj.bedrooms,
-            'bathrooms': property_obj.bathrooms,
-            'area': property_obj.area,
-            'price_per_night': property_obj.price_per_night,
-            'amenities': {
-                'wifi': property_obj.has_wifi,
-                'kitchen': property_obj.has_kitchen,
-                'air_conditioning': property_obj.has_air_conditioning,
-                'heating': property_obj.has_heating,
-                'tv': property_obj.has_tv,
-                'parking': property_obj.has_parking,
-                'pool': property_obj.has_pool,
-                'gym': property_obj.has_gym,
-            },
-            'additional_services': {
-                'maid_service': property_obj.has_maid_service,
-                'car_rental': property_obj.has_car_rental,
-            },
+            'owner': dict(zip(_OWNER_FIELDS, _get_owner_fields(property_obj.owner))),
+            'amenities': dict(zip(_AMENITY_KEYS, _get_amenities(property_obj))),
+            'additional_services': dict(zip(_SERVICE_KEYS, _get_services(property_obj))),
             'images': [
                 {
                     'id': img.id,
-                    'url': img.image.url,
+                    'url': _image_storage.url(img.image.name),
                     'caption': img.caption,
                     'is_primary': img.is_primary,
                 }
                 for img in images
             ],
-            'created_at': property_obj.created_at,
-            'updated_at': property_obj.updated_at,
-        }
+        })
 
-        # Cache the result
-        cache.set(cache_key, property_data, CACHE_TIMEOUT)
+        # Cache the result with its expiry and rebuild time for early refresh
+        delta = time.monotonic() - started
+        cache.set(cache_key, (property_data, time.time() + CACHE_TIMEOUT, delta), CACHE_TIMEOUT)
 
         return property_data
 
@@ -126,8 +308,16 @@ class PropertyService:
             include_all_images: Whether to include all images or just the primary image
                                Default is False to improve performance for landlord dashboard
         """
-        properties = self.property_repository.get_properties_by_owner(owner)
-        return [self._get_property_summary(prop, include_all_images=include_all_images) for prop in properties]
+        cache_key = self._listing_cache_key('ownerprops', owner, include_all_images=include_all_images)
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+
+        rows = self.property_repository.get_properties_by_owner_values(owner)
+        result = self._summaries_from_rows(rows, include_all_images)
+
+        cache.set(cache_key, result, LISTING_CACHE_TIMEOUT)
+        return result
 
     def search_properties(self, page: int = 1, page_size: int = 10, include_all_images: bool = True, owner: User = None, **search_params) -> List[Dict[str, Any]]:
         """
@@ -148,14 +338,69 @@ class PropertyService:
                 - bedrooms: Filter by minimum number of bedrooms (X+)
                 - bathrooms: Filter by minimum number of bathrooms
         """
-        # Add pagination parameters
-        properties = self.property_repository.search_properties(
+        cache_key = self._listing_cache_key(
+            'propsearch', owner, page=page, page_size=page_size,
+            include_all_images=include_all_images, **search_params
+        )
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+
+        # Fetch plain rows rather than model instances for the listing
+        rows = self.property_repository.search_properties_values(
+            page=page,
+            page_size=page_size,
+            owner=owner,
+            **search_params
+        )
+        result = self._summaries_from_rows(rows, include_all_images)
+
+        cache.set(cache_key, result, LISTING_CACHE_TIMEOUT)
+        return result
+
+    def search_properties_page(self, page: int = 1, page_size: int = 10, include_all_images: bool = True,
+                               owner: User = None, **search_params) -> Dict[str, Any]:
+        """
+        Search for one page of properties together with the total number of matches.
+
+        The total comes back with the page rows from a single query; a separate count
+        only runs when the requested page is past the end. Accepts the same filters as
+        search_properties. Returns a dict with results, total, page and page_size.
+        """
+        cache_key = self._listing_cache_key(
+            'propsearchpage', owner, page=page, page_size=page_size,
+            include_all_images=include_all_images, **search_params
+        )
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+
+        rows, total = self.property_repository.search_properties_with_count(
             page=page,
             page_size=page_size,
             owner=owner,
             **search_params
         )
-        return [self._get_property_summary(prop, include_all_images=include_all_images) for prop in properties]
+        if total is None:
+            total = 0 if page == 1 else self.property_repository.count_properties(owner=owner, **search_params)
+
+        result = {
+            'results': self._summaries_from_rows(rows, include_all_images),
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+        }
+
+        cache.set(cache_key, result, LISTING_CACHE_TIMEOUT)
+        return result
+
+    def _summaries_from_rows(self, rows: List[Dict[str, Any]], include_all_images: bool) -> List[Dict[str, Any]]:
+        """
+        Turn listing rows into property summaries, loading every image on the page in
+        one query when the full gallery is requested.
+        """
+        images_by_property = self._get_images_by_property(rows) if include_all_images else {}
+        return [self._get_property_summary_from_values(row, images_by_property.get(row['id'], [])) for row in rows]
 
     def count_properties(self, owner: User = None, **search_params) -> int:
         """
@@ -172,7 +417,12 @@ class PropertyService:
                 - bedrooms: Filter by minimum number of bedrooms (X+)
                 - bathrooms: Filter by minimum number of bathrooms
         """
-        return self.property_repository.count_properties(owner=owner, **search_params)
+        cache_key = self._listing_cache_key('propcount', owner, **search_params)
+        count = cache.get(cache_key)
+        if count is None:
+            count = self.property_repository.count_properties(owner=owner, **search_params)
+            cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+        return count
 
     def update_property(self, property_id: int, owner: User, **property_data) -> Optional[Property]:
         """
@@ -183,8 +433,7 @@ class PropertyService:
             return None
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != owner.id and owner.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to update this property")
+        self._assert_owner_or_admin(property_obj, owner, "You don't have permission to update this property")
 
         # Don't allow changing the owner through this method
         if 'owner' in property_data:
@@ -194,9 +443,7 @@ class PropertyService:
         updated_property = self.property_repository.update_property(property_obj, **property_data)
 
         # Invalidate cache
-        cache_key = f"property_details:{property_id}"
-        cache.delete(cache_key)
-        logger.debug(f"Cache invalidated for property: {property_id}")
+        self._invalidate_property_cache(property_id, property_obj.owner_id)
 
         return updated_property
 
@@ -209,16 +456,13 @@ class PropertyService:
             return False
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to delete this property")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to delete this property")
 
         # Delete the property
         result = self.property_repository.delete_property(property_obj)
 
         # Invalidate cache
-        cache_key = f"property_details:{property_id}"
-        cache.delete(cache_key)
-        logger.debug(f"Cache invalidated for deleted property: {property_id}")
+        self._invalidate_property_cache(property_id, property_obj.owner_id)
 
         return result
 
@@ -232,12 +476,10 @@ class PropertyService:
 
         # Update the status
         property_obj.status = status
-        property_obj.save()
+        property_obj.save(update_fields=['status', 'updated_at'])
 
         # Invalidate cache
-        cache_key = f"property_details:{property_id}"
-        cache.delete(cache_key)
-        logger.debug(f"Cache invalidated for updated property status: {property_id}")
+        self._invalidate_property_cache(property_id, property_obj.owner_id)
 
         return True
 
@@ -250,8 +492,7 @@ class PropertyService:
             return None
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to add images to this property")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to add images to this property")
 
         # Add the image
         property_image = self.property_repository.add_property_image(
@@ -262,68 +503,70 @@ class PropertyService:
         )
 
         # Invalidate cache
-        cache_key = f"property_details:{property_id}"
-        cache.delete(cache_key)
-        logger.debug(f"Cache invalidated for property with new image: {property_id}")
+        self._invalidate_property_cache(property_id, property_obj.owner_id)
 
         return property_image
 
-    def _get_property_summary(self, property_obj: Property, include_all_images: bool = False) -> Dict[str, Any]:
+    def _get_images_by_property(self, rows: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
         """
-        Get a summary of property information.
+        Get the formatted images for a set of property rows, keyed by property id.
 
-        Args:
-            property_obj: The property object to summarize
-            include_all_images: Whether to include all images or just the primary image
-                               Set to False for landlord property listings to improve performance
-        """
-        # Get primary image if available - this is now optimized to avoid N+1 queries
-        # by using prefetch_related in the repository methods
-        primary_image = None
-        if hasattr(property_obj, 'prefetched_images'):
-            # Use prefetched images if available
-            images = property_obj.prefetched_images
-            primary_images = [img for img in images if img.is_primary]
-            primary_image = primary_images[0] if primary_images else (images[0] if images else None)
-        else:
-            # Fallback to database query if prefetched images not available
-            primary_image = PropertyImage.objects.filter(property=property_obj, is_primary=True).first()
-            if not primary_image:
-                primary_image = PropertyImage.objects.filter(property=property_obj).first()
-
-        # Get all images for the property only if requested
-        images = []
-        if include_all_images and hasattr(property_obj, 'prefetched_images'):
-            images = [{
-                'id': img.id,
-                'url': img.image.url,
-                'caption': img.caption,
-                'is_primary': img.is_primary
-            } for img in property_obj.prefetched_images]
+        Each property's image list is cached under its property version; the whole
+        page is read with one get_many and any misses are loaded in one query.
+        """
+        if not rows:
+            return {}
+
+        versions = self._property_versions([row['id'] for row in rows])
+        keys = {property_id: f"v{version}:propimages:{property_id}" for property_id, version in versions.items()}
+        cached = cache.get_many(keys.values())
+        images_by_property = {property_id: cached[key] for property_id, key in keys.items() if key in cached}
+
+        missing = [property_id for property_id in keys if property_id not in images_by_property]
+        if missing:
+            loaded = {property_id: [] for property_id in missing}
+            for img in self.property_repository.get_images_values(missing):
+                loaded[img['property_id']].append({
+                    'id': img['id'],
+                    'url': _image_storage.url(img['image']),
+                    'caption': img['caption'],
+                    'is_primary': img['is_primary']
+                })
+            cache.set_many({keys[property_id]: images for property_id, images in loaded.items()}, IMAGES_CACHE_TIMEOUT)
+            images_by_property.update(loaded)
 
+        return images_by_property
+
+    def _get_property_summary_from_values(self, row: Dict[str, Any], images: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build a property summary from a row returned by the repository's values() listings.
+
+        Args:
+            row: The values() row for the property
+            images: Already formatted images for the property, if requested
+        """
         return {
-            'id': property_obj.id,
-            'title': property_obj.title,
-            'property_type': property_obj.property_type,
-            'status': property_obj.status,
-            'document_verification_status': property_obj.document_verification_status or 'not_submitted',
+            'id': row['id'],
+            'title': row['title'],
+            'property_type': row['property_type'],
+            'status': row['status'],
+            'document_verification_status': row['document_verification_status'] or 'not_submitted',
             'owner': {
-                'id': property_obj.owner.id,
-                'username': property_obj.owner.username,
-                'first_name': property_obj.owner.first_name,
-                'last_name': property_obj.owner.last_name,
-                'name': f"{property_obj.owner.first_name} {property_obj.owner.last_name}".strip() or property_obj.owner.username
+                'id': row['owner_id'],
+                'username': row['owner__username'],
+                'first_name': row['owner__first_name'],
+                'last_name': row['owner__last_name'],
             },
-            'address': property_obj.address,
-            'city': property_obj.city,
-            'state': property_obj.state,
-            'country': property_obj.country,
-            'bedrooms': property_obj.bedrooms,
-            'bathrooms': property_obj.bathrooms,
-            'price_per_night': property_obj.price_per_night,
-            'primary_image': primary_image.image.url if primary_image else None,
-            'images': images,
-            'created_at': property_obj.created_at,
+            'address': row['address'],
+            'city': row['city'],
+            'state': row['state'],
+            'country': row['country'],
+            'bedrooms': row['bedrooms'],
+            'bathrooms': row['bathrooms'],
+            'price_per_night': row['price_per_night'],
+            'primary_image': _image_storage.url(row['primary_image']) if row['primary_image'] else None,
+            'images': images or [],
+            'created_at': row['created_at'],
         }
 
     def add_property_document(self, property_id: int, user: User, document, document_type: str, description: str = None) -> Optional[PropertyDocument]:
@@ -335,8 +578,7 @@ class PropertyService:
             return None
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to add documents to this property")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to add documents to this property")
 
         # Add the document
         document_obj = self.property_repository.add_property_document(
@@ -347,17 +589,38 @@ class PropertyService:
         )
 
         # Update property document verification status if it was not submitted before
-        if property_obj.document_verification_status == Property.DocumentVerificationStatus.NOT_SUBMITTED:
+        if property_obj.document_verification_status == _DOC_NOT_SUBMITTED:
             self.property_repository.update_property_document_verification_status(
                 property_obj=property_obj,
-                status=Property.DocumentVerificationStatus.PENDING
+                status=_DOC_PENDING
             )
 
         # Invalidate cache
-        self._invalidate_property_cache(property_id)
+        self._invalidate_property_cache(property_id, property_obj.owner_id)
 
         return document_obj
 
+    def _user_dict(self, user: User, user_dicts: Dict[int, Dict[str, Any]] = None, name: str = None) -> Dict[str, Any]:
+        """
+        Get the user data shown on documents and feedback.
+        Pass the same user_dicts mapping across a listing to build each user only once,
+        and name when the display name was already computed by the query.
+        """
+        if user_dicts is None:
+            user_dicts = {}
+
+        user_data = user_dicts.get(user.id)
+        if user_data is None:
+            user_data = user_dicts[user.id] = {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'name': name or f"{user.first_name} {user.last_name}".strip() or user.username
+            }
+        return user_data
+
     def get_property_documents(self, property_id: int, user: User) -> List[Dict[str, Any]]:
         """
         Get all documents for a property.
@@ -367,30 +630,30 @@ class PropertyService:
             return []
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to view documents for this property")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to view documents for this property")
 
-        documents = self.property_repository.get_property_documents(property_obj)
+        documents = list(self.property_repository.get_property_documents_with_feedback(property_obj))
+
+        # Count unread messages for every document in one query
+        user_type = 'landlord' if property_obj.owner_id == user.id else 'admin'
+        unread_counts = self.property_repository.get_unread_feedback_counts(
+            [doc.id for doc in documents], user_type
+        )
+
+        # Senders repeat across threads, so build each user dict once
+        user_dicts = {}
 
         result = []
         for doc in documents:
-            # Get feedback thread if it exists
-            feedback_thread = self.property_repository.get_document_feedback_thread(doc)
+            # Feedback thread is prefetched with the documents
             feedback_thread_data = []
 
-            for feedback in feedback_thread:
+            for feedback in doc.feedback_thread.all():
                 feedback_thread_data.append({
                     'id': feedback.id,
                     'document_id': doc.id,
                     'sender_type': feedback.sender_type,
-                    'user': {
-                        'id': feedback.user.id,
-                        'username': feedback.user.username,
-                        'email': feedback.user.email,
-                        'first_name': feedback.user.first_name,
-                        'last_name': feedback.user.last_name,
-                        'name': f"{feedback.user.first_name} {feedback.user.last_name}".strip() or feedback.user.username
-                    },
+                    'user': self._user_dict(feedback.user, user_dicts),
                     'message': feedback.message,
                     'is_read': feedback.is_read,
                     'created_at': feedback.created_at,
@@ -401,13 +664,14 @@ class PropertyService:
                 'id': doc.id,
                 'property_id': property_obj.id,
                 'document_type': doc.document_type,
-                'document': doc.document.url,
+                'document': _document_storage.url(doc.document.name),
                 'description': doc.description,
                 'status': doc.status,
                 'rejection_reason': doc.rejection_reason,
                 'feedback': doc.feedback,
                 'feedback_read': doc.feedback_read,
                 'feedback_thread': feedback_thread_data,
+                'unread_feedback_count': unread_counts[doc.id],
                 'created_at': doc.created_at,
                 'updated_at': doc.updated_at
             })
@@ -425,26 +689,19 @@ class PropertyService:
         property_obj = document_obj.property
 
         # Check if user is the owner or an admin
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to view this document")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to view this document")
 
         # Get feedback thread if it exists
         feedback_thread = self.property_repository.get_document_feedback_thread(document_obj)
         feedback_thread_data = []
+        user_dicts = {}
 
         for feedback in feedback_thread:
             feedback_thread_data.append({
                 'id': feedback.id,
                 'document_id': document_obj.id,
                 'sender_type': feedback.sender_type,
-                'user': {
-                    'id': feedback.user.id,
-                    'username': feedback.user.username,
-                    'email': feedback.user.email,
-                    'first_name': feedback.user.first_name,
-                    'last_name': feedback.user.last_name,
-                    'name': f"{feedback.user.first_name} {feedback.user.last_name}".strip() or feedback.user.username
-                },
+                'user': self._user_dict(feedback.user, user_dicts),
                 'message': feedback.message,
                 'is_read': feedback.is_read,
                 'created_at': feedback.created_at,
@@ -455,7 +712,7 @@ class PropertyService:
             'id': document_obj.id,
             'property_id': property_obj.id,
             'document_type': document_obj.document_type,
-            'document': document_obj.document.url,
+            'document': _document_storage.url(document_obj.document.name),
             'description': document_obj.description,
             'status': document_obj.status,
             'rejection_reason': document_obj.rejection_reason,
@@ -471,7 +728,7 @@ class PropertyService:
         Update the status of a document.
         """
         # Check if user is an admin
-        if user.role != User.Role.ADMIN:
+        if user.role != _ROLE_ADMIN:
             raise ValueError("Only admins can update document status")
 
         document_obj = self.property_repository.get_document_by_id(document_id)
@@ -489,19 +746,15 @@ class PropertyService:
         )
 
         # Update property document verification status based on document status
-        if status == PropertyDocument.DocumentStatus.APPROVED:
+        verification_status = _VERIFICATION_STATUS_FOR_DOCUMENT.get(status)
+        if verification_status:
             self.property_repository.update_property_document_verification_status(
                 property_obj=property_obj,
-                status=Property.DocumentVerificationStatus.VERIFIED
-            )
-        elif status == PropertyDocument.DocumentStatus.REJECTED:
-            self.property_repository.update_property_document_verification_status(
-                property_obj=property_obj,
-                status=Property.DocumentVerificationStatus.REJECTED
+                status=verification_status
             )
 
         # Invalidate cache
-        self._invalidate_property_cache(property_obj.id)
+        self._invalidate_property_cache(property_obj.id, property_obj.owner_id)
 
         return updated_document
 
@@ -510,7 +763,7 @@ class PropertyService:
         Add feedback to a document without changing its status.
         """
         # Check if user is an admin
-        if user.role != User.Role.ADMIN:
+        if user.role != _ROLE_ADMIN:
             raise ValueError("Only admins can add document feedback")
 
         document_obj = self.property_repository.get_document_by_id(document_id)
@@ -541,16 +794,15 @@ class PropertyService:
         property_obj = document_obj.property
 
         # Check if user is the owner of the property
-        if property_obj.owner.id != user.id and user.role != User.Role.ADMIN:
-            raise ValueError("You don't have permission to mark this feedback as read")
+        self._assert_owner_or_admin(property_obj, user, "You don't have permission to mark this feedback as read")
 
         # Mark feedback as read
         updated_document = self.property_repository.mark_document_feedback_read(document_obj)
 
         # Also mark all admin messages in the feedback thread as read if the user is a landlord
-        if property_obj.owner.id == user.id:
+        if property_obj.owner_id == user.id:
             self.property_repository.mark_feedback_thread_as_read(document_obj, 'landlord')
-        elif user.role == User.Role.ADMIN:
+        elif user.role == _ROLE_ADMIN:
             self.property_repository.mark_feedback_thread_as_read(document_obj, 'admin')
 
         # Invalidate cache
@@ -569,9 +821,9 @@ class PropertyService:
         property_obj = document_obj.property
 
         # Determine sender type based on user role
-        if user.role == User.Role.ADMIN:
+        if user.role == _ROLE_ADMIN:
             sender_type = 'admin'
-        elif property_obj.owner.id == user.id:
+        elif property_obj.owner_id == user.id:
             sender_type = 'landlord'
         else:
             raise ValueError("You don't have permission to add feedback to this document")
@@ -591,14 +843,7 @@ class PropertyService:
             'id': feedback.id,
             'document_id': document_obj.id,
             'sender_type': feedback.sender_type,
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'name': f"{user.first_name} {user.last_name}".strip() or user.username
-            },
+            'user': self._user_dict(user),
             'message': feedback.message,
             'is_read': feedback.is_read,
             'created_at': feedback.created_at,
@@ -609,95 +854,86 @@ class PropertyService:
         """
         Get all pending documents (admin only).
         """
-        # Check if user is an admin
-        if user.role != User.Role.ADMIN:
+        return list(self.iter_pending_documents(user))
+
+    def iter_pending_documents(self, user: User) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over pending documents (admin only), reading them from the database in
+        chunks so the whole set of model instances is never held at once.
+        """
+        # Check if user is an admin before handing back the generator
+        if user.role != _ROLE_ADMIN:
             raise ValueError("Only admins can view pending documents")
 
+        return self._generate_pending_documents()
+
+    def _generate_pending_documents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the formatted data for each pending document.
+        """
         documents = self.property_repository.get_pending_documents()
 
-        result = []
-        for doc in documents:
-            try:
-                # Get property information
-                property_data = {
-                    'id': doc.property.id,
-                    'title': doc.property.title,
-                    'property_type': doc.property.property_type,
-                    'city': doc.property.city,
-                    'state': doc.property.state,
-                    'country': doc.property.country,
-                }
+        # Owners and reviewers repeat across documents, so build each user dict once
+        user_dicts = {}
 
-                # Get owner information
-                owner_data = {
-                    'id': doc.property.owner.id,
-                    'username': doc.property.owner.username,
-                    'email': doc.property.owner.email,
-                    'first_name': doc.property.owner.first_name,
-                    'last_name': doc.property.owner.last_name,
-                    'name': f"{doc.property.owner.first_name} {doc.property.owner.last_name}".strip() or doc.property.owner.username
-                }
+        for doc in documents.iterator(chunk_size=PENDING_DOCUMENTS_CHUNK_SIZE):
+            # Property and owner are joined in by the repository query
+            prop = doc.property
+            owner = prop.owner
 
-                # Get feedback thread if it exists
-                feedback_thread = self.property_repository.get_document_feedback_thread(doc)
-                feedback_thread_data = []
-
-                for feedback in feedback_thread:
-                    feedback_thread_data.append({
-                        'id': feedback.id,
-                        'document_id': doc.id,
-                        'sender_type': feedback.sender_type,
-                        'user': {
-                            'id': feedback.user.id,
-                            'username': feedback.user.username,
-                            'email': feedback.user.email,
-                            'first_name': feedback.user.first_name,
-                            'last_name': feedback.user.last_name,
-                            'name': f"{feedback.user.first_name} {feedback.user.last_name}".strip() or feedback.user.username
-                        },
-                        'message': feedback.message,
-                        'is_read': feedback.is_read,
-                        'created_at': feedback.created_at,
-                        'updated_at': feedback.updated_at
-                    })
-
-                # Create document data
-                document_data = {
-                    'id': doc.id,
-                    'property_id': doc.property.id,
-                    'property_title': doc.property.title,
-                    'property_type': doc.property.property_type,
-                    'city': doc.property.city,
-                    'state': doc.property.state,
-                    'country': doc.property.country,
-                    'owner_id': doc.property.owner.id,
-                    'owner_name': owner_data['name'],
-                    'owner_email': doc.property.owner.email,
-                    'owner_username': doc.property.owner.username,
-                    'owner': owner_data,
-                    'property': property_data,
-                    'document_type': doc.document_type,
-                    'document': doc.document.url if doc.document else None,
-                    'description': doc.description,
-                    'status': doc.status,
-                    'rejection_reason': doc.rejection_reason,
-                    'feedback': doc.feedback,
-                    'feedback_read': doc.feedback_read,
-                    'feedback_thread': feedback_thread_data,
-                    'created_at': doc.created_at,
-                    'updated_at': doc.updated_at
-                }
+            # Get property information
+            property_data = {
+                'id': prop.id,
+                'title': prop.title,
+                'property_type': prop.property_type,
+                'city': prop.city,
+                'state': prop.state,
+                'country': prop.country,
+            }
+
+            # Get owner information
+            owner_data = self._user_dict(owner, user_dicts, name=doc.owner_name)
+
+            # Feedback thread is prefetched with the documents
+            feedback_thread_data = []
 
-                result.append(document_data)
-            except Exception as e:
-                logger.error(f"Error processing document {doc.id}: {str(e)}")
-                # Add a minimal document record even if there's an error
-                result.append({
-                    'id': doc.id,
-                    'property_id': getattr(doc.property, 'id', None),
-                    'document_type': doc.document_type,
-                    'status': doc.status,
-                    'created_at': doc.created_at
+            for feedback in doc.feedback_thread.all():
+                feedback_thread_data.append({
+                    'id': feedback.id,
+                    'document_id': doc.id,
+                    'sender_type': feedback.sender_type,
+                    'user': self._user_dict(feedback.user, user_dicts),
+                    'message': feedback.message,
+                    'is_read': feedback.is_read,
+                    'created_at': feedback.created_at,
+                    'updated_at': feedback.updated_at
                 })
 
-        return result
\ No newline at end of file
+            # Create document data
+            document_data = {
+                'id': doc.id,
+                'property_id': prop.id,
+                'property_title': prop.title,
+                'property_type': prop.property_type,
+                'city': prop.city,
+                'state': prop.state,
+                'country': prop.country,
+                'owner_id': owner.id,
+                'owner_name': doc.owner_name,
+                'owner_email': owner.email,
+                'owner_username': owner.username,
+                'owner': owner_data,
+                'property': property_data,
+                'document_type': doc.document_type,
+                'document': _document_storage.url(doc.document.name) if doc.document else None,
+                'description': doc.description,
+                'status': doc.status,
+                'rejection_reason': doc.rejection_reason,
+                'feedback': doc.feedback,
+                'feedback_read': doc.feedback_read,
+                'feedback_thread': feedback_thread_data,
+                'created_at': doc.created_at,
+                'updated_at': doc.updated_at
+            }
+
+            yield document_data
@@ -1,25 +1,23 @@
 from django.test import TestCase
-from django.urls import reverse
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
-from ninja_jwt.tokens import RefreshToken
-import tempfile
-from PIL import Image
-import io
-import json
+from ninja_jwt.tokens import AccessToken
 
-from .models import Property, PropertyImage
-from .services import PropertyService
+from .models import Property, PropertyImage, PropertyDocument
+from .repositories import PropertyRepository
+from .services import PropertyService, _details_l1
 
 User = get_user_model()
 
 class PropertyModelTestCase(TestCase):
     """Tests for the Property model and service layer."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
         # Create test users
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='admin',
             email='admin@example.com',
             password='password123',
@@ -27,14 +25,14 @@ class PropertyModelTestCase(TestCase):
             is_staff=True
         )
         
-        self.agent_user = User.objects.create_user(
+        cls.agent_user = User.objects.create_user(
             username='agent',
             email='agent@example.com',
             password='password123',
             role=User.Role.AGENT
         )
         
-        self.tenant_user = User.objects.create_user(
+        cls.tenant_user = User.objects.create_user(
             username='tenant',
             email='tenant@example.com',
             password='password123',
@@ -42,11 +40,11 @@ class PropertyModelTestCase(TestCase):
         )
         
         # Initialize service
-        self.property_service = PropertyService()
+        cls.property_service = PropertyService()
         
         # Create a test property
-        self.test_property = self.property_service.create_property(
-            owner=self.agent_user,
+        cls.test_property = cls.property_service.create_property(
+            owner=cls.agent_user,
             title="Test Property",
             description="A test property description that is long enough to pass validation",
             property_type=Property.PropertyType.APARTMENT,
@@ -62,6 +60,11 @@ class PropertyModelTestCase(TestCase):
             has_wifi=True,
             has_kitchen=True
         )
+
+    def setUp(self):
+        """Start each test with empty caches, since cache versions outlive rolled back rows."""
+        cache.clear()
+        _details_l1.clear()
     
     def test_property_creation(self):
         """Test property creation."""
@@ -132,10 +135,11 @@ class PropertyModelTestCase(TestCase):
 class PropertyAPITestCase(TestCase):
     """Tests for the Property API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
         # Create test users
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='admin',
             email='admin@example.com',
             password='password123',
@@ -143,27 +147,25 @@ class PropertyAPITestCase(TestCase):
             is_staff=True
         )
         
-        self.agent_user = User.objects.create_user(
+        cls.agent_user = User.objects.create_user(
             username='agent',
             email='agent@example.com',
             password='password123',
             role=User.Role.AGENT
         )
         
-        self.tenant_user = User.objects.create_user(
+        cls.tenant_user = User.objects.create_user(
             username='tenant',
             email='tenant@example.com',
             password='password123',
             role=User.Role.TENANT
         )
         
-        # Set up API client
-        self.client = APIClient()
-        
-        # Create a test property
-        self.property_service = PropertyService()
-        self.test_property = self.property_service.create_property(
-            owner=self.agent_user,
+        # Create an approved test property directly; creation through the service is covered elsewhere
+        cls.property_service = PropertyService()
+        cls.test_property = Property.objects.create(
+            owner=cls.agent_user,
+            status=Property.PropertyStatus.APPROVED,
             title="Test Property",
             description="A test property description that is long enough to pass validation",
             property_type=Property.PropertyType.APARTMENT,
@@ -179,18 +181,15 @@ class PropertyAPITestCase(TestCase):
             has_wifi=True,
             has_kitchen=True
         )
-        
-        # Approve the property
-        self.test_property.status = Property.PropertyStatus.APPROVED
-        self.test_property.save()
-    
-    def get_tokens_for_user(self, user):
-        """Get JWT tokens for a user."""
-        refresh = RefreshToken.for_user(user)
-        return {
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
-        }
+
+        # Sign the agent's access token once; the tests only need it as a bearer header
+        cls.agent_auth = f'Bearer {AccessToken.for_user(cls.agent_user)}'
+
+    def setUp(self):
+        """Set up the API client and start each test with empty caches."""
+        self.client = APIClient()
+        cache.clear()
+        _details_l1.clear()
     
     def test_get_property_list(self):
         """Test getting property list."""
@@ -198,9 +197,10 @@ class PropertyAPITestCase(TestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
+        data = response.json()
         self.assertEqual(len(data['results']), 1)
         self.assertEqual(data['results'][0]['title'], "Test Property")
+        self.assertEqual(data['results'][0]['owner']['name'], "agent")
     
     def test_get_property_detail(self):
         """Test getting property detail."""
@@ -208,19 +208,19 @@ class PropertyAPITestCase(TestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
+        data = response.json()
         self.assertEqual(data['title'], "Test Property")
         self.assertEqual(data['bedrooms'], 2)
         self.assertEqual(data['bathrooms'], '1.5')
         self.assertEqual(data['price_per_night'], '100.00')
+        self.assertTrue(data['amenities']['wifi'])
+        self.assertFalse(data['amenities']['pool'])
+        self.assertEqual(data['owner']['name'], "agent")
     
     def test_create_property(self):
         """Test creating a property."""
-        # Get token for agent user
-        tokens = self.get_tokens_for_user(self.agent_user)
-        
-        # Set authorization header
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        # Authenticate as the agent with the class-level token
+        self.client.credentials(HTTP_AUTHORIZATION=self.agent_auth)
         
         url = '/api/properties/'
         data = {
@@ -243,7 +243,7 @@ class PropertyAPITestCase(TestCase):
         response = self.client.post(url, data, format='json')
         
         self.assertEqual(response.status_code, 201)
-        data = json.loads(response.content)
+        data = response.json()
         self.assertEqual(data['title'], 'New Property')
         self.assertEqual(data['bedrooms'], 3)
         self.assertEqual(data['bathrooms'], '2.0')
@@ -254,11 +254,8 @@ class PropertyAPITestCase(TestCase):
     
     def test_update_property(self):
         """Test updating a property."""
-        # Get token for agent user
-        tokens = self.get_tokens_for_user(self.agent_user)
-        
-        # Set authorization header
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        # Authenticate as the agent with the class-level token
+        self.client.credentials(HTTP_AUTHORIZATION=self.agent_auth)
         
         url = f'/api/properties/{self.test_property.id}'
         data = {
@@ -269,7 +266,7 @@ class PropertyAPITestCase(TestCase):
         response = self.client.put(url, data, format='json')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
+        data = response.json()
         self.assertEqual(data['title'], 'Updated Property')
         self.assertEqual(data['price_per_night'], '200.00')
         
@@ -278,14 +275,75 @@ class PropertyAPITestCase(TestCase):
         self.assertEqual(updated_property.title, 'Updated Property')
         self.assertEqual(updated_property.price_per_night, 200.00)
 
+    def test_filter_properties_by_city_and_type(self):
+        """Test city and property type filters are case-insensitive."""
+        response = self.client.get('/api/properties/', {'city': 'test', 'property_type': 'APARTMENT'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['total'], 1)
+        self.assertEqual(data['results'][0]['city'], "Test City")
+
+        response = self.client.get('/api/properties/', {'city': 'kigali'})
+        data = response.json()
+        self.assertEqual(data['total'], 0)
+
+    def test_property_list_pagination(self):
+        """Test paginated listing reports has_next and the total."""
+        Property.objects.create(
+            owner=self.agent_user,
+            status=Property.PropertyStatus.APPROVED,
+            title="Second Property",
+            description="Another test property description that is long enough",
+            property_type=Property.PropertyType.HOUSE,
+            address="789 Test Avenue",
+            city="Test City",
+            state="Test State",
+            country="Test Country",
+            zip_code="12345",
+            bedrooms=3,
+            bathrooms=2.0,
+            area=1500,
+            price_per_night=200.00
+        )
+
+        data = self.client.get('/api/properties/', {'page_size': 1}).json()
+        self.assertTrue(data['has_next'])
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['total_pages'], 2)
+
+        data = self.client.get('/api/properties/', {'page': 2, 'page_size': 1}).json()
+        self.assertFalse(data['has_next'])
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(data['total'], 2)
+
+        data = self.client.get('/api/properties/', {'page': 3, 'page_size': 1}).json()
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['total'], 2)
+
+    def test_search_properties_short_and_numeric_query(self):
+        """Test numeric queries look up the ID and too-short queries are ignored."""
+        response = self.client.get('/api/properties/', {'query': str(self.test_property.id)})
+        data = response.json()
+        self.assertEqual([prop['id'] for prop in data['results']], [self.test_property.id])
+
+        response = self.client.get('/api/properties/', {'query': str(self.test_property.id + 1000)})
+        data = response.json()
+        self.assertEqual(data['results'], [])
+
+        response = self.client.get('/api/properties/', {'query': 'zz'})
+        data = response.json()
+        self.assertEqual(len(data['results']), 1)
+
     def test_search_properties_query(self):
         """Test searching properties by query (title, address, city, state)."""
-        # Add another property with different fields
-        kigali_villa = self.property_service.create_property(
+        # Add an approved property with distinct fields in a single insert
+        Property.objects.create(
             owner=self.agent_user,
             title="Kigali Villa",
             description="A beautiful villa in Kigali.",
             property_type=Property.PropertyType.VILLA,
+            status=Property.PropertyStatus.APPROVED,
             address="456 Kigali Road",
             city="Kigali",
             state="Kigali Province",
@@ -298,26 +356,309 @@ class PropertyAPITestCase(TestCase):
             has_wifi=True,
             has_kitchen=True
         )
-        # Ensure property is approved so it appears in search results
-        kigali_villa.status = Property.PropertyStatus.APPROVED
-        kigali_villa.save()
-        # Search by title
-        response = self.client.get('/api/properties/', {'query': 'Kigali Villa'})
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
-        self.assertTrue(any(prop['title'] == 'Kigali Villa' for prop in data['results']))
-        # Search by address
-        response = self.client.get('/api/properties/', {'query': 'Kigali Road'})
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
-        self.assertTrue(any(prop['address'] == '456 Kigali Road' for prop in data['results']))
-        # Search by city
+        cases = [
+            ('Kigali Villa', 'title', 'Kigali Villa'),
+            ('Kigali Road', 'address', '456 Kigali Road'),
+            ('Kigali', 'city', 'Kigali'),
+            ('Kigali Province', 'state', 'Kigali Province'),
+        ]
+        # Each query only matches through its own column, so the cases stay separate;
+        # they go through the service since the endpoint is covered once below
+        for query, field, expected in cases:
+            with self.subTest(query=query):
+                results = self.property_service.search_properties(query=query)
+                self.assertIn(expected, [prop[field] for prop in results])
+
         response = self.client.get('/api/properties/', {'query': 'Kigali'})
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
-        self.assertTrue(any('Kigali' in prop['city'] for prop in data['results']))
-        # Search by state
-        response = self.client.get('/api/properties/', {'query': 'Kigali Province'})
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
-        self.assertTrue(any('Kigali Province' in prop['state'] for prop in data['results']))
+        self.assertEqual([prop['title'] for prop in response.json()['results']], ['Kigali Villa'])
+
+
+class PropertyFilterAPITestCase(TestCase):
+    """Tests for the property search filters exposed by the listing endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create one owner and a small set of listings shared by every scenario."""
+        cls.agent_user = User.objects.create_user(
+            username='agent',
+            email='agent@example.com',
+            password='password123',
+            role=User.Role.AGENT
+        )
+        listings = [
+            ('Kigali Apartment', Property.PropertyType.APARTMENT, 'Kigali', 2, 150, Property.PropertyStatus.APPROVED),
+            ('Musanze House', Property.PropertyType.HOUSE, 'Musanze', 3, 800, Property.PropertyStatus.APPROVED),
+            ('Kigali Villa', Property.PropertyType.VILLA, 'Kigali', 5, 1500, Property.PropertyStatus.APPROVED),
+            ('Pending Kigali House', Property.PropertyType.HOUSE, 'Kigali', 3, 600, Property.PropertyStatus.PENDING),
+        ]
+        Property.objects.bulk_create([
+            Property(
+                owner=cls.agent_user,
+                title=title,
+                description="A listing used to exercise the search filters",
+                property_type=property_type,
+                status=status,
+                address="1 Main Street",
+                city=city,
+                state="Test State",
+                country="Rwanda",
+                zip_code="00001",
+                bedrooms=bedrooms,
+                bathrooms=1,
+                area=100,
+                price_per_night=price
+            )
+            for title, property_type, city, bedrooms, price, status in listings
+        ])
+
+    def setUp(self):
+        """Start each test with empty caches."""
+        cache.clear()
+
+    def test_search_filters(self):
+        """Test each filter combination returns the expected number of listings."""
+        scenarios = [
+            ({}, 3),
+            ({'property_type': 'apartment'}, 1),
+            ({'bedrooms': 2}, 1),
+            ({'price_range': '100-500'}, 1),
+            ({'price_range': '1000-any'}, 1),
+            ({'property_type': 'house', 'bedrooms': 3, 'price_range': '500-1000'}, 1),
+            ({'query': 'Kigali'}, 2),
+            ({'city': 'Kigali'}, 2),
+        ]
+        for params, expected_total in scenarios:
+            with self.subTest(params=params):
+                response = self.client.get('/api/properties/', params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['total'], expected_total)
+
+class DocumentFeedbackRepositoryTestCase(TestCase):
+    """Tests for the document feedback repository helpers."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='password123',
+            role=User.Role.ADMIN,
+            is_staff=True
+        )
+
+        self.agent_user = User.objects.create_user(
+            username='agent',
+            email='agent@example.com',
+            password='password123',
+            role=User.Role.AGENT
+        )
+
+        self.test_property = Property.objects.create(
+            owner=self.agent_user,
+            title="Test Property",
+            description="A test property description that is long enough to pass validation",
+            property_type=Property.PropertyType.APARTMENT,
+            address="123 Test Street",
+            city="Test City",
+            state="Test State",
+            country="Test Country",
+            zip_code="12345",
+            bedrooms=2,
+            bathrooms=1.5,
+            area=1000,
+            price_per_night=100.00
+        )
+
+        self.documents = [
+            PropertyDocument.objects.create(
+                property=self.test_property,
+                document=f'property_documents/doc_{i}.pdf',
+                document_type=PropertyDocument.DocumentType.DEED
+            )
+            for i in range(3)
+        ]
+
+        # Two unread admin messages on the first document, one on the second
+        for doc in (self.documents[0], self.documents[0], self.documents[1]):
+            PropertyRepository.add_document_feedback_message(doc, self.admin_user, "Please resend", 'admin')
+        # Landlord replies are not counted for the landlord
+        PropertyRepository.add_document_feedback_message(self.documents[0], self.agent_user, "Done", 'landlord')
+
+    def test_get_unread_feedback_counts(self):
+        """Test unread counts are grouped per document and default to zero."""
+        doc_ids = [doc.id for doc in self.documents]
+        with self.assertNumQueries(1):
+            counts = PropertyRepository.get_unread_feedback_counts(doc_ids, 'landlord')
+
+        self.assertEqual(counts, {doc_ids[0]: 2, doc_ids[1]: 1, doc_ids[2]: 0})
+        self.assertEqual(PropertyRepository.get_unread_feedback_count(self.documents[0], 'admin'), 1)
+
+    def test_mark_feedback_threads_as_read(self):
+        """Test a whole set of threads is marked read with one statement."""
+        doc_ids = [doc.id for doc in self.documents]
+        with self.assertNumQueries(1):
+            PropertyRepository.mark_feedback_threads_as_read(doc_ids, 'landlord')
+
+        counts = PropertyRepository.get_unread_feedback_counts(doc_ids, 'landlord')
+        self.assertEqual(sum(counts.values()), 0)
+        # Messages sent by the landlord stay unread for the admin
+        self.assertEqual(PropertyRepository.get_unread_feedback_count(self.documents[0], 'admin'), 1)
+
+
+    def test_property_documents_prefetch_feedback(self):
+        """Test listing documents loads every feedback thread in a fixed number of queries."""
+        service = PropertyService()
+        with self.assertNumQueries(4):
+            documents = service.get_property_documents(self.test_property.id, self.agent_user)
+
+        threads = {doc['id']: doc['feedback_thread'] for doc in documents}
+        self.assertEqual(len(threads[self.documents[0].id]), 3)
+        self.assertEqual(threads[self.documents[0].id][-1]['user']['username'], 'agent')
+        self.assertEqual(threads[self.documents[2].id], [])
+
+
+    def test_pending_documents_query_count(self):
+        """Test pending documents and their threads load in a fixed number of queries."""
+        with self.assertNumQueries(2):
+            documents = PropertyService().get_pending_documents(self.admin_user)
+
+        self.assertEqual(len(documents), 3)
+        self.assertEqual({doc['owner']['username'] for doc in documents}, {'agent'})
+        # Owner has no first or last name, so the SQL-built name falls back to the username
+        self.assertEqual({doc['owner_name'] for doc in documents}, {'agent'})
+        self.assertEqual(sum(len(doc['feedback_thread']) for doc in documents), 4)
+
+
+class PropertyImageRepositoryTestCase(TestCase):
+    """Tests for property image repository helpers."""
+
+    def setUp(self):
+        """Set up test data and start with empty caches."""
+        cache.clear()
+        _details_l1.clear()
+        self.agent_user = User.objects.create_user(
+            username='agent',
+            email='agent@example.com',
+            password='password123',
+            role=User.Role.AGENT
+        )
+
+        self.test_property = Property.objects.create(
+            owner=self.agent_user,
+            title="Test Property",
+            description="A test property description that is long enough to pass validation",
+            property_type=Property.PropertyType.APARTMENT,
+            address="123 Test Street",
+            city="Test City",
+            state="Test State",
+            country="Test Country",
+            zip_code="12345",
+            bedrooms=2,
+            bathrooms=1.5,
+            area=1000,
+            price_per_night=100.00
+        )
+
+    def test_add_primary_image_demotes_previous(self):
+        """Test only one image stays primary."""
+        first = PropertyRepository.add_property_image(self.test_property, 'property_images/a.jpg', is_primary=True)
+        second = PropertyRepository.add_property_image(self.test_property, 'property_images/b.jpg', is_primary=True)
+
+        first.refresh_from_db()
+        self.assertFalse(first.is_primary)
+        self.assertTrue(second.is_primary)
+
+    def test_bulk_add_property_images(self):
+        """Test bulk insertion keeps a single primary image."""
+        PropertyRepository.add_property_image(self.test_property, 'property_images/a.jpg', is_primary=True)
+        images = PropertyRepository.bulk_add_property_images(self.test_property, [
+            {'image': 'property_images/b.jpg', 'is_primary': True},
+            {'image': 'property_images/c.jpg', 'is_primary': True},
+            {'image': 'property_images/d.jpg', 'caption': 'Garden'},
+        ])
+
+        self.assertEqual(len(images), 3)
+        primary = PropertyImage.objects.get(property=self.test_property, is_primary=True)
+        self.assertEqual(primary.image.name, 'property_images/b.jpg')
+        self.assertEqual(PropertyImage.objects.filter(property=self.test_property).count(), 4)
+
+    def test_owner_properties_primary_image(self):
+        """Test owner listings resolve the primary image without loading images."""
+        PropertyRepository.add_property_image(self.test_property, 'property_images/a.jpg')
+        PropertyRepository.add_property_image(self.test_property, 'property_images/b.jpg', is_primary=True)
+
+        with self.assertNumQueries(1):
+            summaries = PropertyService().get_owner_properties(self.agent_user)
+        self.assertEqual(len(summaries), 1)
+        self.assertTrue(summaries[0]['primary_image'].endswith('property_images/b.jpg'))
+        self.assertEqual(summaries[0]['images'], [])
+
+    def test_property_details_single_flight(self):
+        """Test an expiring details entry is served stale while another request refreshes it."""
+        service = PropertyService()
+        cache.clear()
+        details = service.get_property_details(self.test_property.id)
+        cache_key = f"v{service._property_version(self.test_property.id)}:property_details:{self.test_property.id}"
+
+        # Entry past its expiry while another request holds the rebuild lock
+        _details_l1.clear()
+        cache.set(cache_key, (details, 0, 1.0))
+        cache.add(f"lock:{cache_key}", 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(service.get_property_details(self.test_property.id), details)
+
+        # The lock holder rebuilds the entry and releases the lock
+        _details_l1.clear()
+        cache.delete(f"lock:{cache_key}")
+        self.assertEqual(service.get_property_details(self.test_property.id)['id'], self.test_property.id)
+        self.assertIsNone(cache.get(f"lock:{cache_key}"))
+        self.assertGreater(cache.get(cache_key)[1], 0)
+
+    def test_property_update_invalidates_cached_details(self):
+        """Test updating a property moves its details to a new cache version."""
+        service = PropertyService()
+        self.assertEqual(service.get_property_details(self.test_property.id)['title'], "Test Property")
+
+        service.update_property(self.test_property.id, self.agent_user, title="Renamed Property")
+        self.assertEqual(service.get_property_details(self.test_property.id)['title'], "Renamed Property")
+
+    def test_search_results_cached_until_property_changes(self):
+        """Test search results come from cache until a listed property changes."""
+        service = PropertyService()
+        service.update_property_status(self.test_property.id, Property.PropertyStatus.APPROVED)
+        self.assertEqual(len(service.search_properties(city="Test City")), 1)
+        self.assertEqual(service.count_properties(city="Test City"), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(service.search_properties(city="Test City")), 1)
+            self.assertEqual(service.count_properties(city="Test City"), 1)
+
+        service.update_property_status(self.test_property.id, Property.PropertyStatus.DENIED)
+        self.assertEqual(service.search_properties(city="Test City"), [])
+
+    def test_property_details_served_from_process_cache(self):
+        """Test repeated detail reads skip the shared cache until the version changes."""
+        service = PropertyService()
+        details = service.get_property_details(self.test_property.id)
+
+        cache_key = f"v{service._property_version(self.test_property.id)}:property_details:{self.test_property.id}"
+        cache.delete(cache_key)
+        with self.assertNumQueries(0):
+            self.assertIs(service.get_property_details(self.test_property.id), details)
+
+        service.update_property(self.test_property.id, self.agent_user, title="Renamed Property")
+        self.assertEqual(service.get_property_details(self.test_property.id)['title'], "Renamed Property")
+
+    def test_listing_images_cached_per_property(self):
+        """Test listing galleries are cached per property and refreshed when images change."""
+        service = PropertyService()
+        PropertyRepository.add_property_image(self.test_property, 'property_images/a.jpg', is_primary=True)
+        rows = [{'id': self.test_property.id}]
+
+        self.assertEqual(len(service._get_images_by_property(rows)[self.test_property.id]), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(service._get_images_by_property(rows)[self.test_property.id]), 1)
+
+        service.add_property_image(self.test_property.id, self.agent_user, 'property_images/b.jpg')
+        self.assertEqual(len(service._get_images_by_property(rows)[self.test_property.id]), 2)
@@ -27,6 +27,15 @@ class CustomUserAdmin(UserAdmin):
     )
     search_fields = ('username', 'first_name', 'last_name', 'email')
     ordering = ('username',)
+    # Columns the changelist renders; the change form still loads the whole row
+    changelist_fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role', 'birthday', 'is_staff')
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            queryset = queryset.only(*self.changelist_fields)
+        return queryset
 
     def is_adult(self, obj):
         return obj.is_adult
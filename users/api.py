@@ -1,11 +1,10 @@
 from typing import List, Optional
 from ninja_extra import api_controller, route
-from ninja_jwt.authentication import JWTAuth
 from django.http import HttpRequest
-from django.db.models import Q
 import logging
 
 from .services import UserService
+from .auth import CachedJWTAuth, SlimJWTAuth
 from .models import User
 from .schemas import (
     UserRegistrationSchema,
@@ -34,10 +33,8 @@ class UserController:
     def register(self, request, data: UserRegistrationSchema):
         """Register a new user"""
         try:
-            # Debug logging
-            logger.info(f"Request received: {request}")
-            logger.info(f"Request body: {request.body}")
-            logger.info(f"Data received: {data}")
+            # Lazy formatting: the message is only built when DEBUG logging is enabled
+            logger.debug("Register payload received for username: %s", getattr(data, 'username', None))
 
             if data is None:
                 logger.error("Data is None, registration cannot proceed")
@@ -55,7 +52,7 @@ class UserController:
                 birthday=data.birthday
             )
             logger.info(f"User registered successfully: {user.id}")
-            return 201, self.user_service.get_user_profile(user.id)
+            return 201, self.user_service.get_user_profile_for(user)
         except ValueError as e:
             logger.warning(f"Registration failed: {str(e)}")
             return 400, {"message": str(e)}
@@ -63,21 +60,20 @@ class UserController:
             logger.error(f"Unexpected error during registration: {str(e)}")
             return 500, {"message": "An unexpected error occurred"}
 
-    @route.get("/profile", auth=JWTAuth(), response=UserProfileSchema)
+    @route.get("/profile", auth=CachedJWTAuth(), response=UserProfileSchema)
     def get_profile(self, request: HttpRequest):
         """Get the current user's profile"""
-        return self.user_service.get_user_profile(request.user.id)
+        return self.user_service.get_user_profile_for(request.user)
 
-    @route.put("/profile", auth=JWTAuth(), response=UserProfileSchema)
+    @route.put("/profile", auth=SlimJWTAuth(), response=UserProfileSchema)
     def update_profile(self, request: HttpRequest, data: UserProfileUpdateSchema):
         """Update the current user's profile"""
-        user = self.user_service.update_user_profile(
+        return self.user_service.update_user_profile(
             user_id=request.user.id,
             **data.dict(exclude_unset=True)
         )
-        return self.user_service.get_user_profile(user.id)
 
-    @route.post("/change-password", auth=JWTAuth(), response={200: MessageResponse, 400: MessageResponse})
+    @route.post("/change-password", auth=SlimJWTAuth(), response={200: MessageResponse, 400: MessageResponse})
     def change_password(self, request: HttpRequest, data: PasswordChangeSchema):
         """Change the current user's password"""
         success = self.user_service.change_password(
@@ -93,19 +89,17 @@ class UserController:
     def google_auth(self, request, data: GoogleAuthSchema):
         """Authenticate with Google"""
         try:
-            logger.info(f"Google auth attempt with token: {data.credential[:10]}..., role: {data.role}, role type: {type(data.role)}")
+            logger.info("Google auth attempt with token: %s..., role: %s", data.credential[:10], data.role)
             result = self.user_service.authenticate_google(
                 credential=data.credential,
                 role=data.role
             )
 
-            # If user_exists is False, return the result directly
-            if result.get('user_exists') is False:
-                logger.info(f"Google auth: new user detected, email: {result.get('email')}")
-                return 200, result
-
-            # Otherwise, log the success and return the result
-            logger.info(f"Google auth successful for user: {result['user']['username']}")
+            # New users get their Google details back to finish sign-up; either way the result is returned as is
+            if 'user' in result:
+                logger.info("Google auth successful for user: %s", result['user']['username'])
+            else:
+                logger.info("Google auth: new user detected, email: %s", result['email'])
             return 200, result
         except ValueError as e:
             logger.warning(f"Google auth failed: {str(e)}")
@@ -133,20 +127,18 @@ class UserController:
     def twitter_auth_callback(self, request, data: TwitterCallbackSchema):
         """Authenticate with Twitter"""
         try:
-            logger.info(f"Twitter auth callback attempt with token: {data.oauth_token[:10]}..., role: {data.role}")
+            logger.info("Twitter auth callback attempt with token: %s..., role: %s", data.oauth_token[:10], data.role)
             result = self.user_service.authenticate_twitter(
                 oauth_token=data.oauth_token,
                 oauth_verifier=data.oauth_verifier,
                 role=data.role
             )
 
-            # If user_exists is False, return the result directly
-            if result.get('user_exists') is False:
-                logger.info(f"Twitter auth: new user detected")
-                return 200, result
-
-            # Otherwise, log the success and return the result
-            logger.info(f"Twitter auth successful for user: {result['user']['username']}")
+            # New users get their Twitter details back to finish sign-up; either way the result is returned as is
+            if 'user' in result:
+                logger.info("Twitter auth successful for user: %s", result['user']['username'])
+            else:
+                logger.info("Twitter auth: new user detected")
             return 200, result
         except ValueError as e:
             logger.warning(f"Twitter auth callback failed: {str(e)}")
@@ -158,37 +150,28 @@ class UserController:
     @route.get("/agents", response=List[UserProfileSchema])
     def get_agents(self, request: HttpRequest):
         """Get all agents/landlords"""
-        users = self.user_service.get_users_by_role(User.Role.AGENT)
-        return [self.user_service.get_user_profile(user.id) for user in users]
+        return self.user_service.get_agent_profiles()
 
     @route.get("/", auth=None, response=List[UserProfileSchema])
     def get_all_users(self, request: HttpRequest, role: Optional[str] = None,
-                      is_active: Optional[str] = None, pending: Optional[str] = None,
+                      is_active: Optional[bool] = None, pending: Optional[bool] = None,
                       query: Optional[str] = None):
         """Get all users (public for testing)"""
-        # Start with all users
-        queryset = User.objects.all()
+        # Start with all users, narrowed by the indexed search column when a query is given
+        queryset = self.user_service.search_users(query) if query else User.objects.all()
 
         # Apply filters
         if role:
             queryset = queryset.filter(role=role)
 
-        # Convert is_active string to boolean
+        # Ninja has already parsed the boolean query parameters
         if is_active is not None:
-            is_active_bool = is_active.lower() == 'true'
-            queryset = queryset.filter(is_active=is_active_bool)
+            queryset = queryset.filter(is_active=is_active)
 
         # Handle pending status (agents waiting for approval)
-        if pending and pending.lower() == 'true':
+        if pending:
             queryset = queryset.filter(role=User.Role.AGENT, is_active=False)
 
-        # Apply search query
-        if query:
-            queryset = queryset.filter(
-                Q(username__icontains=query) |
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query) |
-                Q(email__icontains=query)
-            )
-
-        return [self.user_service.get_user_profile(user.id) for user in queryset]
\ No newline at end of file
+        # Profiles are built from a chunked iterator, so model instances are never all held at
+        # once; the list itself still goes through the response schema
+        return list(self.user_service.iter_user_profiles(queryset))
\ No newline at end of file
@@ -1,9 +1,34 @@
+import functools
+import hashlib
+import threading
+import time
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.contrib.auth.hashers import check_password, make_password
+from django.db.models import Case, Q, When
+from django.utils.crypto import get_random_string
+from django.utils.translation import gettext_lazy as _
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.exceptions import AuthenticationFailed, InvalidToken
+from ninja_jwt.settings import api_settings
 
 User = get_user_model()
 
+# Columns permission checks read from request.user
+SLIM_USER_FIELDS = ('id', 'username', 'is_staff', 'role', 'is_active')
+
+# Recently validated access tokens keyed by a hash of the raw token. Entries also carry the
+# token's expiry, so a cached token is never trusted past its own exp claim.
+_validated_tokens = TTLCache(maxsize=10000, ttl=10)
+_validated_tokens_lock = threading.Lock()
+
+@functools.cache
+def _dummy_password_hash():
+    """Hash checked against when no user matches, built once with the default hasher."""
+    return make_password(get_random_string(32))
+
 class EmailOrUsernameModelBackend(ModelBackend):
     """
     Authentication backend that allows login with either username or email.
@@ -12,21 +37,79 @@ class EmailOrUsernameModelBackend(ModelBackend):
         if username is None or password is None:
             return None
         
-        # Check if the username is an email (contains @)
-        is_email = '@' in username
-        
-        try:
-            # Try to find the user by username or email
-            if is_email:
-                user = User.objects.get(email=username)
-            else:
-                user = User.objects.get(username=username)
-                
-            # Check the password
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
-            # Run the default password hasher once to reduce the timing
-            # difference between an existing and a nonexistent user.
-            User().set_password(password)
+        user = self._lookup(username).first()
+
+        if user is None:
+            # Verify against a stored dummy hash so a nonexistent user costs
+            # the same as a wrong password for an existing one.
+            check_password(password, _dummy_password_hash())
+            return None
+
+        # Check the password
+        if user.check_password(password):
+            return user
+        return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Async login: the lookup uses the async ORM and the password hash runs on a worker
+        thread, so concurrent logins don't queue behind each other on the sync thread.
+        """
+        if username is None or password is None:
             return None
+
+        user = await self._lookup(username).afirst()
+
+        encoded = user.password if user is not None else _dummy_password_hash()
+        if await sync_to_async(check_password, thread_sensitive=False)(password, encoded) and user is not None:
+            return user
+        return None
+
+    @staticmethod
+    def _lookup(username):
+        # One indexed lookup for either identifier. Emails aren't unique, so several rows can
+        # match; the username match sorts first and wins over accounts sharing it as an email
+        return User.objects.filter(Q(username=username) | Q(email=username)).order_by(
+            Case(When(username=username, then=0), default=1), 'pk'
+        )
+
+class CachedJWTAuth(JWTAuth):
+    """
+    JWT authentication that skips signature verification for recently seen tokens.
+
+    Only token validation is cached; the user is still loaded on every request so
+    deactivated accounts are rejected straight away.
+    """
+    @classmethod
+    def get_validated_token(cls, raw_token):
+        key = hashlib.sha256(raw_token.encode()).digest()
+        with _validated_tokens_lock:
+            cached = _validated_tokens.get(key)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
+        validated_token = super().get_validated_token(raw_token)
+        with _validated_tokens_lock:
+            _validated_tokens[key] = (validated_token, validated_token['exp'])
+        return validated_token
+
+
+class SlimJWTAuth(CachedJWTAuth):
+    """
+    JWT authentication that loads only the user columns needed for permission checks.
+    """
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = User.objects.only(*SLIM_USER_FIELDS).get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found")) from e
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"))
+
+        return user
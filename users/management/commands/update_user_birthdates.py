@@ -1,40 +1,44 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
+from dateutil.relativedelta import relativedelta
 import random
 from users.models import User
 
+# Users updated per UPDATE statement
+BATCH_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = 'Update existing users with adult birthdates'
 
     def handle(self, *args, **options):
         # Get all users without a birthdate
-        users = User.objects.filter(birthday__isnull=True)
-        
-        if not users.exists():
+        users = User.objects.filter(birthday__isnull=True).order_by('id').only('id', 'birthday')
+
+        total_users = users.count()
+        if not total_users:
             self.stdout.write(self.style.SUCCESS('No users need updating'))
             return
-        
-        total_users = users.count()
+
+        today = timezone.now().date()
         updated_count = 0
-        
-        for user in users:
-            # Generate random adult age between 18-65
-            age = random.randint(18, 65)
-            
-            # Calculate birthdate based on age
-            today = timezone.now().date()
-            # Subtract years plus a random offset for month/day to make it more realistic
-            random_days = random.randint(0, 364)  # Random days in a year
-            birthdate = today.replace(year=today.year - age) - timedelta(days=random_days)
-            
-            # Update user
-            user.birthday = birthdate
-            user.save(update_fields=['birthday'])
-            updated_count += 1
-            
-            if updated_count % 10 == 0:
-                self.stdout.write(f'Updated {updated_count}/{total_users} users...')
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully updated {updated_count} users with adult birthdates')) 
\ No newline at end of file
+
+        # Updated users drop out of the filter, so each pass takes the next batch from the start
+        while batch := list(users[:BATCH_SIZE]):
+            for user in batch:
+                # Generate random adult age between 18-65
+                age = random.randint(18, 65)
+
+                # Subtract years plus a random offset for month/day to make it more realistic
+                random_days = random.randint(0, 364)  # Random days in a year
+                user.birthday = today - relativedelta(years=age) - timedelta(days=random_days)
+
+            with transaction.atomic():
+                User.objects.bulk_update(batch, ['birthday'])
+            updated_count += len(batch)
+
+            self.stdout.write(f'Updated {updated_count}/{total_users} users...')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {updated_count} users with adult birthdates'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-15 23:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    """Add a trigram GIN index so substring search on search_text can use an index on PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS user_search_text_trgm_idx '
+        'ON users_user USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS user_search_text_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_stripe_customer_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_text',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower(django.db.models.functions.text.Concat('username', models.Value(' '), 'first_name', models.Value(' '), 'last_name', models.Value(' '), 'email')), output_field=models.TextField()),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
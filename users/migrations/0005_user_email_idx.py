@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-15 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_user_search_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Lower
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from datetime import date
-from dateutil.relativedelta import relativedelta
 
 class User(AbstractUser):
     """
@@ -32,6 +33,16 @@ class User(AbstractUser):
     # Payment fields
     stripe_customer_id = models.CharField(max_length=255, blank=True, null=True, verbose_name=_('Stripe Customer ID'))
     
+    # Lowercased username, names and email maintained by the database, so user search
+    # is a single column match instead of four case-insensitive ones
+    search_text = models.GeneratedField(
+        expression=Lower(Concat(
+            'username', Value(' '), 'first_name', Value(' '), 'last_name', Value(' '), 'email'
+        )),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -39,6 +50,10 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _('User')
         verbose_name_plural = _('Users')
+        indexes = [
+            # Email sign-in and registration checks look users up by email
+            models.Index(fields=['email'], name='user_email_idx'),
+        ]
     
     def __str__(self):
         return self.username
@@ -63,5 +78,6 @@ class User(AbstractUser):
         if not self.birthday:
             return False
         today = date.today()
-        age = relativedelta(today, self.birthday).years
+        # Whole years, less one if this year's birthday hasn't come yet
+        age = today.year - self.birthday.year - ((today.month, today.day) < (self.birthday.month, self.birthday.day))
         return age >= 18
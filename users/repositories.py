@@ -1,8 +1,41 @@
-from typing import Optional, List, Tuple
-from django.db.models import Q, Count
-from django.core.paginator import Paginator
+import re
+from typing import Optional, List, Dict, Any, Set
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from properties.models import Property
+from bookings.models import Booking
 from .models import User
 
+
+def _related_count(model, field: str) -> Coalesce:
+    """
+    Correlated COUNT of `model` rows pointing at the outer user through `field`.
+    """
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('id')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+# Built once; annotate() resolves a copy, so the expressions are safe to share between queries
+_PROPERTIES_COUNT = _related_count(Property, 'owner')
+_BOOKINGS_COUNT = _related_count(Booking, 'tenant')
+
+# Numeric suffix appended to a base username to make it unique
+_USERNAME_SUFFIX_RE = re.compile(r'\d+')
+
+# Columns a user profile is built from
+PROFILE_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'role', 'phone_number', 'bio',
+    'profile_picture', 'birthday', 'date_joined'
+)
+
+# Columns the admin user list renders, fetched as plain rows
+ADMIN_LIST_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'role', 'is_active', 'date_joined',
+    'properties_count', 'bookings_count'
+)
+
 class UserRepository:
     """
     Repository for User model operations.
@@ -42,6 +75,20 @@ class UserRepository:
         except User.DoesNotExist:
             return None
 
+    @staticmethod
+    def next_available_username(base: str) -> str:
+        """
+        Get `base` if it is free, otherwise `base` with the next unused numeric suffix,
+        using one prefix query on the username index instead of probing each candidate.
+        """
+        taken = User.objects.filter(username__startswith=base).values_list('username', flat=True)
+        suffixes = [username[len(base):] for username in taken]
+        if '' not in suffixes:
+            return base
+
+        numbers = [int(suffix) for suffix in suffixes if _USERNAME_SUFFIX_RE.fullmatch(suffix)]
+        return f"{base}{max(numbers, default=0) + 1}"
+
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
         """
@@ -52,6 +99,20 @@ class UserRepository:
         except User.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_taken_identifiers(email: str, username: str) -> Set[str]:
+        """
+        Get which of 'email' and 'username' already belong to a user, from one query.
+        """
+        taken = set()
+        matches = User.objects.filter(Q(email=email) | Q(username=username)).values_list('email', 'username')
+        for user_email, user_username in matches[:2]:
+            if user_email == email:
+                taken.add('email')
+            if user_username == username:
+                taken.add('username')
+        return taken
+
     @staticmethod
     def get_users_by_role(role: str) -> List[User]:
         """
@@ -64,12 +125,9 @@ class UserRepository:
         """
         Search users by username, first name, last name, or email.
         """
-        return User.objects.filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query)
-        )
+        # Substring match on the generated search column; on PostgreSQL the pg_trgm GIN
+        # index serves it, which full-text search could not do for partial names/emails
+        return User.objects.filter(search_text__contains=query.lower())
 
     @staticmethod
     def update_user(user: User, **kwargs) -> User:
@@ -82,10 +140,21 @@ class UserRepository:
         # Handle password separately
         if 'password' in kwargs:
             user.set_password(kwargs['password'])
-
-        user.save()
+            user.save(update_fields=[*kwargs, 'updated_at'])
+        elif kwargs:
+            # Write only the given columns, without a full-row save or model signals;
+            # update() skips auto_now, so stamp updated_at explicitly
+            user.updated_at = timezone.now()
+            User.objects.filter(pk=user.pk).update(**kwargs, updated_at=user.updated_at)
         return user
 
+    @staticmethod
+    def update_user_status(user_id: int, is_active: bool) -> bool:
+        """
+        Set a user's active flag with a single UPDATE; False if no such user.
+        """
+        return User.objects.filter(id=user_id).update(is_active=is_active, updated_at=timezone.now()) > 0
+
     @staticmethod
     def delete_user(user_id: int) -> bool:
         """
@@ -99,11 +168,10 @@ class UserRepository:
             return False
 
     @staticmethod
-    def get_all_users(page: int = 1, page_size: int = 10, role: Optional[str] = None,
-                      is_active: Optional[bool] = None, search_query: Optional[str] = None) -> Tuple[List[User], int, int]:
+    def _filter_users(role: Optional[str] = None, is_active: Optional[bool] = None,
+                      search_query: Optional[str] = None):
         """
-        Get all users with pagination and filtering.
-        Returns a tuple of (users, total_count, total_pages)
+        Users matching the admin list filters.
         """
         # Start with all users
         queryset = User.objects.all()
@@ -116,32 +184,48 @@ class UserRepository:
             queryset = queryset.filter(is_active=is_active)
 
         if search_query:
-            queryset = queryset.filter(
-                Q(username__icontains=search_query) |
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(email__icontains=search_query)
-            )
-
-        # Annotate with property and booking counts
+            queryset = queryset.filter(search_text__contains=search_query.lower())
+
+        return queryset
+
+    @staticmethod
+    def count_users(role: Optional[str] = None, is_active: Optional[bool] = None,
+                    search_query: Optional[str] = None) -> int:
+        """
+        Count users matching the admin list filters.
+        """
+        return UserRepository._filter_users(role, is_active, search_query).count()
+
+    @staticmethod
+    def get_all_users(page: int = 1, page_size: int = 10, role: Optional[str] = None,
+                      is_active: Optional[bool] = None, search_query: Optional[str] = None,
+                      after: Optional[str] = None, with_total: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get one page of users as rows, ordered by username.
+        When `after` is given the page starts after that username instead of at an
+        offset, so deep pages don't scan and discard the rows before them.
+        With `with_total` each row also carries `total_count`, the number of matching
+        users, computed by a window count in the same query.
+        """
+        queryset = UserRepository._filter_users(role, is_active, search_query)
+
+        # Annotate with property and booking counts; subqueries instead of joins so the two
+        # relations don't multiply into each other
         queryset = queryset.annotate(
-            properties_count=Count('properties', distinct=True),
-            bookings_count=Count('bookings', distinct=True)
+            properties_count=_PROPERTIES_COUNT,
+            bookings_count=_BOOKINGS_COUNT
         )
 
-        # Order by username
-        queryset = queryset.order_by('username')
+        fields = ADMIN_LIST_FIELDS
+        if with_total:
+            queryset = queryset.annotate(total_count=Window(expression=Count('*')))
+            fields += ('total_count',)
 
-        # Paginate
-        paginator = Paginator(queryset, page_size)
-        total_pages = paginator.num_pages
-        total_count = paginator.count
+        # Order by username
+        queryset = queryset.order_by('username').values(*fields)
 
-        # Get page
-        try:
-            users = paginator.page(page)
-        except:
-            # If page is out of range, return last page
-            users = paginator.page(total_pages if total_pages > 0 else 1)
+        if after is not None:
+            return list(queryset.filter(username__gt=after)[:page_size])
 
-        return list(users), total_count, total_pages
\ No newline at end of file
+        offset = (page - 1) * page_size
+        return list(queryset[offset:offset + page_size])
@@ -121,4 +121,5 @@ class PaginatedUserResponse(Schema):
     total: int
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+    next_cursor: Optional[str] = None
@@ -1,15 +1,46 @@
 from typing import Optional, Dict, Any, List
+import hashlib
+import math
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import tweepy
 import secrets
+import threading
+from cachetools import TTLCache
 from django.contrib.auth import authenticate
 from django.conf import settings
-from allauth.socialaccount.models import SocialApp, SocialAccount, SocialToken
-from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
-from .repositories import UserRepository
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from ninja_jwt.tokens import RefreshToken
+from .repositories import UserRepository, PROFILE_FIELDS
 from .models import User
 
+# Attempts at claiming a free username when concurrent social sign-ups share a base name
+SOCIAL_USERNAME_ATTEMPTS = 3
+
+# Roles a social sign-up may pick, by the value the frontend sends
+_SOCIAL_ROLES = {'tenant': User.Role.TENANT, 'agent': User.Role.AGENT}
+
+# Admin list totals are cached briefly and dropped when users are created, edited or removed
+USER_COUNT_CACHE_TIMEOUT = 60
+USER_LIST_VERSION_KEY = 'ver:user_list'
+AGENT_PROFILES_CACHE_TIMEOUT = 60
+
+# Verified Google ID tokens keyed by their sha256 digest. An entry lives at most a minute and
+# never past the token's own exp, so Google's verdict is re-checked regularly.
+_google_tokens = TTLCache(maxsize=10000, ttl=60)
+_google_tokens_lock = threading.Lock()
+
+# Pooled keep-alive connections to Google, so logins reuse the TLS session instead of
+# handshaking each time; (connect, read) timeouts keep a slow endpoint from holding workers
+GOOGLE_HTTP_TIMEOUT = (3.05, 5)
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                                    max_retries=Retry(total=1, backoff_factor=0.1)))
+
 class UserService:
     """
     Service for user-related business logic.
@@ -22,41 +53,30 @@ class UserService:
         """
         Register a new user.
         """
-        # Check if user with email already exists
-        existing_user = self.user_repository.get_user_by_email(email)
-        if existing_user:
+        # Check whether the email or username is already in use, in one query
+        taken = self.user_repository.get_taken_identifiers(email, username)
+        if 'email' in taken:
             raise ValueError("User with this email already exists")
-
-        # Check if user with username already exists
-        existing_user = self.user_repository.get_user_by_username(username)
-        if existing_user:
+        if 'username' in taken:
             raise ValueError("User with this username already exists")
 
         # Create the user
-        return self.user_repository.create_user(
+        user = self.user_repository.create_user(
             username=username,
             email=email,
             password=password,
             role=role,
             **kwargs
         )
+        self._invalidate_user_list_cache()
+        return user
 
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """
         Authenticate a user with username/email and password.
         """
-        # Try to authenticate with username
-        user = authenticate(username=username, password=password)
-
-        # If authentication failed, try with email
-        if not user:
-            try:
-                user_obj = User.objects.get(email=username)
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                pass
-
-        return user
+        # EmailOrUsernameModelBackend resolves either identifier in one query and one hash check
+        return authenticate(username=username, password=password)
 
     def authenticate_google(self, credential: str, role: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -90,68 +110,41 @@ class UserService:
 
         if not user:
             # Validate role
-            print(f"Validating role: {role}, type: {type(role)}")
-            print(f"Valid roles: {User.Role.TENANT}, {User.Role.AGENT}, types: {type(User.Role.TENANT)}, {type(User.Role.AGENT)}")
-
-            # Convert role string to User.Role enum value if needed
-            if role == 'tenant':
-                role = User.Role.TENANT
-            elif role == 'agent':
-                role = User.Role.AGENT
-
-            if role not in [User.Role.TENANT, User.Role.AGENT]:
+            if role not in _SOCIAL_ROLES:
                 raise ValueError(f"Invalid role: {role}. Must be 'tenant' or 'agent'. Valid roles are: {User.Role.TENANT}, {User.Role.AGENT}")
 
-            # Create a new user
-            username = email.split('@')[0]  # Use part before @ as username
-            base_username = username
-            counter = 1
-
-            # Make sure username is unique
-            while self.user_repository.get_user_by_username(username):
-                username = f"{base_username}{counter}"
-                counter += 1
-
-            # Create user with the selected role
-            user = self.user_repository.create_user(
-                username=username,
+            # Create user with the selected role, named after the part before @ and made unique
+            user = self._create_social_user(
+                email.split('@')[0],
                 email=email,
                 password=None,  # No password for social auth users
                 first_name=google_user_info.get('given_name', ''),
                 last_name=google_user_info.get('family_name', ''),
-                role=role,  # Use the selected role
+                role=_SOCIAL_ROLES[role],  # Use the selected role
                 is_active=True
             )
 
             # Update Google ID
             user.google_id = google_user_info.get('id')
             user.save()
+            self._invalidate_user_list_cache()
         elif not user.google_id:
             # Update existing user with Google ID
             user.google_id = google_user_info.get('id')
             user.save()
         elif role:
-            # Convert role string to User.Role enum value if needed
-            if role == 'tenant':
-                role_value = User.Role.TENANT
-            elif role == 'agent':
-                role_value = User.Role.AGENT
-            else:
-                role_value = role
-
             # If the user exists but is trying to sign in with a different role,
             # return an error message
-            if role_value != user.role:
+            if _SOCIAL_ROLES.get(role, role) != user.role:
                 raise ValueError(f"You already have an account with the role '{user.role}'. Please sign in with that role.")
 
         # Generate JWT tokens
-        from ninja_jwt.tokens import RefreshToken
         refresh = RefreshToken.for_user(user)
 
         return {
             'access_token': str(refresh.access_token),
             'refresh_token': str(refresh),
-            'user': self.get_user_profile(user.id),
+            'user': self.get_user_profile_for(user),
             'user_exists': True
         }
 
@@ -159,10 +152,18 @@ class UserService:
         """
         Verify the Google ID token and extract user information.
         """
+        key = hashlib.sha256(id_token.encode()).hexdigest()
+        with _google_tokens_lock:
+            cached = _google_tokens.get(key)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
         try:
             # Verify the token with Google's tokeninfo endpoint
-            response = requests.get(
-                f'https://oauth2.googleapis.com/tokeninfo?id_token={id_token}'
+            response = _http.get(
+                'https://oauth2.googleapis.com/tokeninfo',
+                params={'id_token': id_token},
+                timeout=GOOGLE_HTTP_TIMEOUT
             )
 
             if response.status_code != 200:
@@ -184,11 +185,32 @@ class UserService:
                 'verified_email': token_info.get('email_verified') == 'true'
             }
 
+            # Repeat logins with the same credential skip the round trip to Google
+            exp = int(token_info.get('exp') or 0)
+            if exp > time.time():
+                with _google_tokens_lock:
+                    _google_tokens[key] = (user_info, exp)
+
             return user_info
         except Exception as e:
             print(f"Error verifying Google ID token: {e}")
             return None
 
+    def _create_social_user(self, base_username: str, **fields) -> User:
+        """
+        Create a social sign-up under the next free variant of `base_username`, retrying with
+        a fresh suffix when a concurrent sign-up claims the same username first.
+        """
+        for attempt in range(SOCIAL_USERNAME_ATTEMPTS):
+            username = self.user_repository.next_available_username(base_username)
+            try:
+                # Savepoint, so a lost race doesn't break an enclosing transaction
+                with transaction.atomic():
+                    return self.user_repository.create_user(username=username, **fields)
+            except IntegrityError:
+                if attempt == SOCIAL_USERNAME_ATTEMPTS - 1:
+                    raise
+
     def initialize_twitter_auth(self) -> Dict[str, str]:
         """
         Initialize Twitter OAuth authentication.
@@ -240,6 +262,11 @@ class UserService:
             # Get user info
             twitter_user = api.verify_credentials(include_email=True)
 
+            # Split the display name once: first word, then the rest
+            first_name, _, last_name = (twitter_user.name or '').partition(' ')
+            # Only present when the app has email access
+            twitter_email = getattr(twitter_user, 'email', None)
+
             # Check if user exists with this Twitter ID
             user = User.objects.filter(twitter_id=twitter_user.id_str).first()
 
@@ -247,78 +274,49 @@ class UserService:
             if not user and not role:
                 return {
                     'user_exists': False,
-                    'email': getattr(twitter_user, 'email', None),
-                    'first_name': twitter_user.name.split(' ')[0] if twitter_user.name else '',
-                    'last_name': ' '.join(twitter_user.name.split(' ')[1:]) if twitter_user.name and ' ' in twitter_user.name else '',
+                    'email': twitter_email,
+                    'first_name': first_name,
+                    'last_name': last_name,
                     'twitter_id': twitter_user.id_str,
                     'picture': twitter_user.profile_image_url_https
                 }
 
             if not user:
                 # Validate role
-                if role == 'tenant':
-                    role_value = User.Role.TENANT
-                elif role == 'agent':
-                    role_value = User.Role.AGENT
-                else:
-                    role_value = role
-
-                if role_value not in [User.Role.TENANT, User.Role.AGENT]:
+                if role not in _SOCIAL_ROLES:
                     raise ValueError(f"Invalid role: {role}. Must be 'tenant' or 'agent'")
 
-                # Create a new user
-                email = getattr(twitter_user, 'email', None)
-                if not email:
-                    # Generate a temporary email if Twitter doesn't provide one
-                    random_string = secrets.token_hex(8)
-                    email = f"twitter_{twitter_user.id_str}_{random_string}@example.com"
-
-                # Use Twitter username or screen name as username
-                username = twitter_user.screen_name
-                base_username = username
-                counter = 1
-
-                # Make sure username is unique
-                while self.user_repository.get_user_by_username(username):
-                    username = f"{base_username}{counter}"
-                    counter += 1
-
-                # Create user with the selected role
-                user = self.user_repository.create_user(
-                    username=username,
+                # Create a new user, with a temporary email if Twitter doesn't provide one
+                email = twitter_email or f"twitter_{twitter_user.id_str}_{secrets.token_hex(8)}@example.com"
+
+                # Create user with the selected role, using the Twitter screen name made unique
+                user = self._create_social_user(
+                    twitter_user.screen_name,
                     email=email,
                     password=None,  # No password for social auth users
-                    first_name=twitter_user.name.split(' ')[0] if twitter_user.name else '',
-                    last_name=' '.join(twitter_user.name.split(' ')[1:]) if twitter_user.name and ' ' in twitter_user.name else '',
-                    role=role_value,
+                    first_name=first_name,
+                    last_name=last_name,
+                    role=_SOCIAL_ROLES[role],
                     is_active=True
                 )
 
                 # Update Twitter ID
                 user.twitter_id = twitter_user.id_str
                 user.save()
+                self._invalidate_user_list_cache()
             elif role:
-                # Convert role string to User.Role enum value if needed
-                if role == 'tenant':
-                    role_value = User.Role.TENANT
-                elif role == 'agent':
-                    role_value = User.Role.AGENT
-                else:
-                    role_value = role
-
                 # If the user exists but is trying to sign in with a different role,
                 # return an error message
-                if role_value != user.role:
+                if _SOCIAL_ROLES.get(role, role) != user.role:
                     raise ValueError(f"You already have an account with the role '{user.role}'. Please sign in with that role.")
 
             # Generate JWT tokens
-            from ninja_jwt.tokens import RefreshToken
             refresh = RefreshToken.for_user(user)
 
             return {
                 'access_token': str(refresh.access_token),
                 'refresh_token': str(refresh),
-                'user': self.get_user_profile(user.id),
+                'user': self.get_user_profile_for(user),
                 'user_exists': True
             }
         except Exception as e:
@@ -327,12 +325,32 @@ class UserService:
 
     def get_user_profile(self, user_id: int) -> Optional[Dict[str, Any]]:
         """
-        Get a user's profile.
+        Get a user's profile, loading only the columns it includes.
         """
-        user = self.user_repository.get_user_by_id(user_id)
+        user = User.objects.only(*PROFILE_FIELDS).filter(id=user_id).first()
         if not user:
             return None
 
+        return self.get_user_profile_for(user)
+
+    def get_user_profiles(self, users) -> List[Dict[str, Any]]:
+        """
+        Build profiles for a queryset of users in one query instead of re-fetching each user.
+        """
+        return [self.get_user_profile_for(user) for user in users.only(*PROFILE_FIELDS)]
+
+    def iter_user_profiles(self, users, chunk_size: int = 200):
+        """
+        Yield profiles for a queryset of users, reading rows in chunks instead of all at once.
+        """
+        for user in users.only(*PROFILE_FIELDS).iterator(chunk_size=chunk_size):
+            yield self.get_user_profile_for(user)
+
+    @staticmethod
+    def get_user_profile_for(user: User) -> Dict[str, Any]:
+        """
+        Build a user's profile from an already loaded instance, without another query.
+        """
         return {
             'id': user.id,
             'username': user.username,
@@ -348,9 +366,9 @@ class UserService:
             'date_joined': user.date_joined
         }
 
-    def update_user_profile(self, user_id: int, **kwargs) -> Optional[User]:
+    def update_user_profile(self, user_id: int, **kwargs) -> Optional[Dict[str, Any]]:
         """
-        Update user profile.
+        Update user profile and return the updated profile.
         """
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
@@ -360,13 +378,18 @@ class UserService:
         if 'role' in kwargs:
             del kwargs['role']
 
-        return self.user_repository.update_user(user, **kwargs)
+        user = self.user_repository.update_user(user, **kwargs)
+        self._invalidate_user_list_cache()
+
+        # The saved instance already holds the new values, so no re-fetch is needed
+        return self.get_user_profile_for(user)
 
     def change_password(self, user_id: int, old_password: str, new_password: str) -> bool:
         """
         Change user password.
         """
-        user = self.user_repository.get_user_by_id(user_id)
+        # Only the hash is needed to verify and replace the password
+        user = User.objects.only('id', 'password').filter(id=user_id).first()
         if not user:
             return False
 
@@ -376,7 +399,7 @@ class UserService:
 
         # Update password
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password', 'updated_at'])
         return True
 
     def get_users_by_role(self, role: str) -> List[User]:
@@ -392,32 +415,112 @@ class UserService:
         return self.user_repository.search_users(query)
 
     def get_all_users(self, page: int = 1, page_size: int = 10, role: Optional[str] = None,
-                      is_active: Optional[bool] = None, search_query: Optional[str] = None) -> tuple:
+                      is_active: Optional[bool] = None, search_query: Optional[str] = None,
+                      after: Optional[str] = None) -> tuple:
         """
         Get all users with pagination and filtering.
+        Returns a tuple of (user rows, total_count, total_pages); `after` switches to
+        keyset pagination starting after that username.
         """
-        return self.user_repository.get_all_users(
+        count_key = self._user_count_cache_key(role, is_active, search_query)
+        total = cache.get(count_key)
+        if total is None and after is None and page >= 1:
+            # No cached total: let the page query carry it as a window count instead of
+            # running a separate COUNT first
+            users = self.user_repository.get_all_users(
+                page=page,
+                page_size=page_size,
+                role=role,
+                is_active=is_active,
+                search_query=search_query,
+                with_total=True
+            )
+            if users:
+                total = users[0]['total_count']
+                for row in users:
+                    del row['total_count']
+                cache.set(count_key, total, USER_COUNT_CACHE_TIMEOUT)
+                return users, total, math.ceil(total / page_size)
+
+        if total is None:
+            total = self.count_users(role=role, is_active=is_active, search_query=search_query)
+        total_pages = math.ceil(total / page_size)
+
+        # If page is out of range, return last page
+        if page < 1 or page > total_pages:
+            page = total_pages or 1
+
+        users = self.user_repository.get_all_users(
             page=page,
             page_size=page_size,
             role=role,
             is_active=is_active,
-            search_query=search_query
+            search_query=search_query,
+            after=after
         )
+        return users, total, total_pages
+
+    def count_users(self, role: Optional[str] = None, is_active: Optional[bool] = None,
+                    search_query: Optional[str] = None) -> int:
+        """
+        Count users matching the admin list filters, with caching.
+        """
+        cache_key = self._user_count_cache_key(role, is_active, search_query)
+        count = cache.get(cache_key)
+        if count is None:
+            count = self.user_repository.count_users(role=role, is_active=is_active, search_query=search_query)
+            cache.set(cache_key, count, USER_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def get_agent_profiles(self) -> List[Dict[str, Any]]:
+        """
+        Get the profiles of all agents, cached until the user list changes.
+        """
+        cache_key = f"v{self._user_list_version()}:agents"
+        profiles = cache.get(cache_key)
+        if profiles is None:
+            profiles = self.get_user_profiles(self.get_users_by_role(User.Role.AGENT))
+            cache.set(cache_key, profiles, AGENT_PROFILES_CACHE_TIMEOUT)
+        return profiles
+
+    def _user_count_cache_key(self, role: Optional[str], is_active: Optional[bool],
+                              search_query: Optional[str]) -> str:
+        """
+        Cache key for the total of one admin list filter combination.
+        """
+        digest = hashlib.blake2b(repr((role, is_active, search_query)).encode(), digest_size=8).hexdigest()
+        return f"v{self._user_list_version()}:usercount:{digest}"
+
+    @staticmethod
+    def _user_list_version() -> int:
+        """
+        Current user list version, seeded on first use.
+        """
+        return cache.get_or_set(USER_LIST_VERSION_KEY, lambda: int(time.time()), None)
+
+    def _invalidate_user_list_cache(self):
+        """
+        Move the user list version forward, orphaning cached totals and agent profiles.
+        """
+        try:
+            cache.incr(USER_LIST_VERSION_KEY)
+        except ValueError:
+            cache.set(USER_LIST_VERSION_KEY, int(time.time()), None)
 
     def delete_user(self, user_id: int) -> bool:
         """
         Delete a user.
         """
-        return self.user_repository.delete_user(user_id)
+        deleted = self.user_repository.delete_user(user_id)
+        if deleted:
+            self._invalidate_user_list_cache()
+        return deleted
 
     def update_user_status(self, user_id: int, is_active: bool) -> bool:
         """
         Update user status (active/inactive).
         """
-        user = self.user_repository.get_user_by_id(user_id)
-        if not user:
-            return False
-
-        user.is_active = is_active
-        user.save()
-        return True
\ No newline at end of file
+        updated = self.user_repository.update_user_status(user_id, is_active)
+        if updated:
+            self._invalidate_user_list_cache()
+        return updated
\ No newline at end of file
@@ -1,8 +1,20 @@
 from django.test import TestCase
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from ninja_jwt.tokens import RefreshToken
+from ninja_jwt.exceptions import AuthenticationFailed
+from datetime import date, timedelta
+from unittest.mock import patch, MagicMock
+from asgiref.sync import async_to_sync
+import time
+from properties.models import Property
+from bookings.models import Booking
+from .repositories import UserRepository
+from .services import UserService, _google_tokens
+from .schemas import UserProfileSchema
+from .auth import CachedJWTAuth, SlimJWTAuth, EmailOrUsernameModelBackend, _validated_tokens
 import json
 
 User = get_user_model()
@@ -34,6 +46,9 @@ class UserAPITestCase(TestCase):
         
         # Set up API client
         self.client = APIClient()
+        cache.clear()
+        _validated_tokens.clear()
+        _google_tokens.clear()
     
     def get_tokens_for_user(self, user):
         refresh = RefreshToken.for_user(user)
@@ -150,3 +165,369 @@ class UserAPITestCase(TestCase):
         self.assertEqual(login_response.status_code, 200)
         login_response_data = json.loads(login_response.content)
         self.assertIn('access', login_response_data)
+
+    def test_admin_user_list_counts(self):
+        """Test the admin user list annotates property and booking counts"""
+        listing = Property.objects.create(
+            owner=self.agent_user, title='Counted Property', description='A property used to check counts',
+            property_type=Property.PropertyType.APARTMENT, address='1 Count Street', city='Count City',
+            state='State', country='Country', zip_code='12345', bedrooms=1, bathrooms=1, area=50,
+            price_per_night=50
+        )
+        Property.objects.create(
+            owner=self.agent_user, title='Second Property', description='Another property used to check counts',
+            property_type=Property.PropertyType.HOUSE, address='2 Count Street', city='Count City',
+            state='State', country='Country', zip_code='12345', bedrooms=2, bathrooms=1, area=80,
+            price_per_night=80
+        )
+        for offset in (1, 10, 20):
+            Booking.objects.create(
+                property=listing, tenant=self.tenant_user,
+                check_in_date=date.today() + timedelta(days=offset),
+                check_out_date=date.today() + timedelta(days=offset + 2),
+                total_price=100
+            )
+
+        with self.assertNumQueries(1):
+            users = UserRepository.get_all_users(page=1, page_size=10)
+        counts = {user['username']: (user['properties_count'], user['bookings_count']) for user in users}
+
+        self.assertEqual(len(users), 3)
+        self.assertEqual(counts['agent'], (2, 0))
+        self.assertEqual(counts['tenant'], (0, 3))
+        self.assertEqual(counts['admin'], (0, 0))
+
+    def test_admin_list_users(self):
+        """Test admins can list users with their counts"""
+        tokens = self.get_tokens_for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+
+        response = self.client.get('/api/admin/users/', {'role': User.Role.AGENT})
+
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.content)
+        self.assertEqual(response_data['total'], 1)
+        item = response_data['items'][0]
+        self.assertEqual(item['username'], 'agent')
+        self.assertEqual(item['properties_count'], 0)
+        self.assertFalse(item['is_adult'])
+
+    def test_admin_list_users_forbidden(self):
+        """Test non-admin users cannot list users"""
+        tokens = self.get_tokens_for_user(self.tenant_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+
+        response = self.client.get('/api/admin/users/')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_slim_jwt_auth_defers_profile_fields(self):
+        """Test admin auth loads only the fields permission checks need"""
+        token = RefreshToken.for_user(self.admin_user).access_token
+
+        user = SlimJWTAuth().get_user(token)
+
+        self.assertEqual(user.pk, self.admin_user.pk)
+        self.assertIn('bio', user.get_deferred_fields())
+        self.assertIn('profile_picture', user.get_deferred_fields())
+
+    def test_cached_jwt_auth_reuses_validated_token(self):
+        """Test a repeated access token is validated once and still loads the user"""
+        token = str(RefreshToken.for_user(self.tenant_user).access_token)
+        auth = CachedJWTAuth()
+
+        first = auth.get_validated_token(token)
+        self.assertIs(auth.get_validated_token(token), first)
+
+        self.tenant_user.is_active = False
+        self.tenant_user.save(update_fields=['is_active'])
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_user(auth.get_validated_token(token))
+
+    def test_list_users_single_query(self):
+        """Test the public user list builds every profile from one query"""
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/')
+
+        self.assertEqual(response.status_code, 200)
+        users = response.json()
+        self.assertEqual(len(users), 3)
+        # The body is the validated UserProfileSchema list
+        self.assertEqual(set(users[0]), set(UserProfileSchema.model_fields))
+
+    def test_admin_list_users_keyset(self):
+        """Test admins can page through users with the username cursor"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_tokens_for_user(self.admin_user)["access"]}')
+
+        first = self.client.get('/api/admin/users/', {'page_size': 2}).json()
+        self.assertEqual([item['username'] for item in first['items']], ['admin', 'agent'])
+        self.assertEqual(first['total'], 3)
+        self.assertEqual(first['next_cursor'], 'agent')
+
+        second = self.client.get('/api/admin/users/', {'page_size': 2, 'after': first['next_cursor']}).json()
+        self.assertEqual([item['username'] for item in second['items']], ['tenant'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_search_users_by_name_and_email(self):
+        """Test user search matches usernames, names and email case-insensitively"""
+        User.objects.filter(pk=self.agent_user.pk).update(first_name='Grace', last_name='Uwase')
+
+        self.assertEqual([user.username for user in UserRepository.search_users('GRACE')], ['agent'])
+        self.assertEqual([user.username for user in UserRepository.search_users('grace uwase')], ['agent'])
+        self.assertEqual(UserRepository.search_users('example.com').count(), 3)
+
+        # Partial words match, and the public list combines search with its filters
+        response = self.client.get('/api/users/', {'query': 'uwa', 'role': User.Role.AGENT})
+        self.assertEqual([user['username'] for user in response.json()], ['agent'])
+
+    def test_is_adult_birthday_boundary(self):
+        """Test users count as adults from the year they turn 18"""
+        year = date.today().year
+
+        self.tenant_user.birthday = date(year - 18, 1, 1)
+        self.assertTrue(self.tenant_user.is_adult)
+
+        self.tenant_user.birthday = date(year - 17, 12, 31)
+        self.assertFalse(self.tenant_user.is_adult)
+
+    def test_email_or_username_backend_single_query(self):
+        """Test the backend resolves username or email in one query, preferring the username"""
+        backend = EmailOrUsernameModelBackend()
+        # Another account uses the agent's username as its email
+        User.objects.create_user(username='other', email='agent', password='otherpass123')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(backend.authenticate(None, username='agent', password='password123'), self.agent_user)
+        self.assertEqual(backend.authenticate(None, username='tenant@example.com', password='password123'), self.tenant_user)
+        self.assertIsNone(backend.authenticate(None, username='agent', password='otherpass123'))
+        self.assertIsNone(backend.authenticate(None, username='nobody', password='password123'))
+
+    def test_email_or_username_backend_prefers_username_over_shared_emails(self):
+        """Test a username match wins even when several other accounts use it as their email"""
+        backend = EmailOrUsernameModelBackend()
+        User.objects.create_user(username='other1', email='agent', password='otherpass123')
+        User.objects.create_user(username='other2', email='agent', password='otherpass123')
+        aauthenticate = async_to_sync(backend.aauthenticate)
+
+        self.assertEqual(backend.authenticate(None, username='agent', password='password123'), self.agent_user)
+        self.assertEqual(aauthenticate(None, username='agent', password='password123'), self.agent_user)
+        self.assertIsNone(backend.authenticate(None, username='agent', password='otherpass123'))
+
+    @patch('users.services._http.get')
+    def test_google_token_verification_cached(self, mock_get):
+        """Test a verified Google credential is reused until it expires"""
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = {
+            'sub': '123', 'email': 'g@example.com', 'email_verified': 'true',
+            'exp': str(int(time.time()) + 300),
+        }
+        service = UserService()
+
+        first = service._verify_google_id_token('credential')
+        second = service._verify_google_id_token('credential')
+        self.assertEqual(first, second)
+        self.assertEqual(first['email'], 'g@example.com')
+        self.assertEqual(mock_get.call_count, 1)
+
+        # Rejected tokens are never cached
+        mock_get.return_value.status_code = 400
+        self.assertIsNone(service._verify_google_id_token('bad'))
+        self.assertIsNone(service._verify_google_id_token('bad'))
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch.object(CachedJWTAuth, 'get_validated_token')
+    def test_public_routes_skip_jwt(self, mock_validate):
+        """Test public routes never parse the Authorization header"""
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, 200)
+        mock_validate.assert_not_called()
+
+    def test_update_user_writes_given_columns(self):
+        """Test update_user issues a single UPDATE and keeps the instance in sync"""
+        before = self.tenant_user.updated_at
+        with self.assertNumQueries(1):
+            user = UserRepository.update_user(self.tenant_user, first_name='Tess', bio='Quiet')
+        self.assertEqual(user.first_name, 'Tess')
+
+        self.tenant_user.refresh_from_db()
+        self.assertEqual((self.tenant_user.first_name, self.tenant_user.bio), ('Tess', 'Quiet'))
+        self.assertGreater(self.tenant_user.updated_at, before)
+        before = self.tenant_user.updated_at
+
+        UserRepository.update_user(self.tenant_user, password='newpassword123')
+        self.tenant_user.refresh_from_db()
+        self.assertTrue(self.tenant_user.check_password('newpassword123'))
+        self.assertGreater(self.tenant_user.updated_at, before)
+
+    def test_agent_list_cached_until_users_change(self):
+        """Test the agent list is served from cache and refreshed after a registration"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_tokens_for_user(self.tenant_user)['access']}")
+        self.assertEqual(len(self.client.get('/api/users/agents').json()), 1)
+
+        service = UserService()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(service.get_agent_profiles()), 1)
+
+        service.register_user('agent2', 'agent2@example.com', 'password123', role=User.Role.AGENT)
+        self.assertEqual(len(self.client.get('/api/users/agents').json()), 2)
+
+    def test_email_or_username_backend_async(self):
+        """Test the async backend keeps email login and rejects bad credentials"""
+        aauthenticate = async_to_sync(EmailOrUsernameModelBackend().aauthenticate)
+
+        self.assertEqual(aauthenticate(None, username='tenant@example.com', password='password123'), self.tenant_user)
+        self.assertEqual(aauthenticate(None, username='agent', password='password123'), self.agent_user)
+        self.assertIsNone(aauthenticate(None, username='agent', password='wrongpassword'))
+        self.assertIsNone(aauthenticate(None, username='nobody', password='password123'))
+
+    def test_admin_user_list_total_from_window_count(self):
+        """Test a cold admin page gets its total from the page query itself"""
+        service = UserService()
+        with self.assertNumQueries(1):
+            users, total, total_pages = service.get_all_users(page=1, page_size=2)
+        self.assertEqual((len(users), total, total_pages), (2, 3, 2))
+        self.assertNotIn('total_count', users[0])
+
+        # The total is cached, so an out-of-range page is clamped without counting again
+        with self.assertNumQueries(1):
+            users, total, _ = service.get_all_users(page=5, page_size=2)
+        self.assertEqual([user['username'] for user in users], ['tenant'])
+
+    def test_list_users_boolean_filters(self):
+        """Test is_active and pending accept the usual boolean spellings"""
+        self.agent_user.is_active = False
+        self.agent_user.save()
+
+        response = self.client.get('/api/users/', {'is_active': 'False'})
+        self.assertEqual([user['username'] for user in response.json()], ['agent'])
+
+        response = self.client.get('/api/users/', {'pending': '1'})
+        self.assertEqual([user['username'] for user in response.json()], ['agent'])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_tokens_for_user(self.admin_user)['access']}")
+        response = self.client.get('/api/admin/users/', {'is_active': 'true'})
+        self.assertEqual(response.json()['total'], 2)
+
+    @patch('users.services._http.get')
+    def test_google_token_cache_honours_exp(self, mock_get):
+        """Test a cached Google token is re-verified once it has expired"""
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = {'sub': '1', 'email': 'g@example.com', 'exp': str(int(time.time()) + 5)}
+        service = UserService()
+
+        service._verify_google_id_token('credential')
+        with patch('users.services.time.time', return_value=time.time() + 10):
+            service._verify_google_id_token('credential')
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_next_available_username(self):
+        """Test free usernames are kept and taken ones get the next numeric suffix"""
+        self.assertEqual(UserRepository.next_available_username('newcomer'), 'newcomer')
+
+        for username in ('agent1', 'agent7', 'agentx', 'agent_smith'):
+            User.objects.create_user(username=username, email=f'{username}@example.com', password='password123')
+        with self.assertNumQueries(1):
+            self.assertEqual(UserRepository.next_available_username('agent'), 'agent8')
+        self.assertEqual(UserRepository.next_available_username('tenant'), 'tenant1')
+
+    def test_authenticate_user_by_username_or_email(self):
+        """Test authenticate_user accepts either identifier with a single lookup"""
+        service = UserService()
+        self.assertEqual(service.authenticate_user('tenant@example.com', 'password123'), self.tenant_user)
+        self.assertEqual(service.authenticate_user('tenant', 'password123'), self.tenant_user)
+        self.assertIsNone(service.authenticate_user('tenant@example.com', 'wrongpassword'))
+
+    @patch('users.services._http.get')
+    def test_google_signup_roles(self, mock_get):
+        """Test Google sign-up maps the chosen role and rejects anything else"""
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = {
+            'sub': '42', 'email': 'new@example.com', 'given_name': 'New', 'family_name': 'Agent',
+            'exp': str(int(time.time()) + 300),
+        }
+        service = UserService()
+
+        with self.assertRaises(ValueError):
+            service.authenticate_google('credential', role='admin')
+
+        result = service.authenticate_google('credential', role='agent')
+        self.assertEqual(result['user']['role'], User.Role.AGENT)
+        with self.assertRaises(ValueError):
+            service.authenticate_google('credential', role='tenant')
+
+    def test_register_user_conflicts(self):
+        """Test registration reports a taken email before a taken username"""
+        service = UserService()
+        with self.assertRaisesMessage(ValueError, 'email already exists'):
+            service.register_user('agent', 'tenant@example.com', 'password123')
+        with self.assertRaisesMessage(ValueError, 'username already exists'):
+            service.register_user('agent', 'fresh@example.com', 'password123')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(UserRepository.get_taken_identifiers('fresh@example.com', 'fresh'), set())
+
+    def test_get_user_profile_loads_profile_columns(self):
+        """Test a profile by id is built from one query without deferred loads"""
+        with self.assertNumQueries(1):
+            profile = UserService().get_user_profile(self.tenant_user.id)
+        self.assertEqual((profile['username'], profile['email']), ('tenant', 'tenant@example.com'))
+        self.assertIsNone(UserService().get_user_profile(0))
+
+    def test_update_user_status_single_update(self):
+        """Test status changes write the flag without loading the user"""
+        service = UserService()
+        before = self.agent_user.updated_at
+        with self.assertNumQueries(1):
+            self.assertTrue(service.update_user_status(self.agent_user.id, False))
+        self.agent_user.refresh_from_db()
+        self.assertFalse(self.agent_user.is_active)
+        self.assertGreater(self.agent_user.updated_at, before)
+
+        before = self.agent_user.updated_at
+        self.assertTrue(service.change_password(self.agent_user.id, 'password123', 'newpassword123'))
+        self.agent_user.refresh_from_db()
+        self.assertGreater(self.agent_user.updated_at, before)
+        self.assertFalse(service.update_user_status(0, True))
+
+    @patch('users.services.tweepy')
+    def test_twitter_auth_splits_display_name(self, mock_tweepy):
+        """Test the Twitter display name splits into first and last name, including when missing"""
+        mock_tweepy.OAuth1UserHandler.return_value.get_access_token.return_value = ('token', 'secret')
+        twitter_user = mock_tweepy.API.return_value.verify_credentials.return_value
+        twitter_user.id_str = '77'
+        service = UserService()
+
+        for name, expected in (('Ada King Lovelace', ('Ada', 'King Lovelace')), ('Ada', ('Ada', '')), (None, ('', ''))):
+            with self.subTest(name=name):
+                twitter_user.name = name
+                result = service.authenticate_twitter('oauth-token', 'verifier')
+                self.assertEqual((result['first_name'], result['last_name']), expected)
+
+    @patch('users.services.tweepy')
+    def test_twitter_signup_email_fallback(self, mock_tweepy):
+        """Test Twitter sign-up keeps the provided email or generates a placeholder"""
+        mock_tweepy.OAuth1UserHandler.return_value.get_access_token.return_value = ('token', 'secret')
+        twitter_user = mock_tweepy.API.return_value.verify_credentials.return_value
+        twitter_user.name = 'Tweety Bird'
+        twitter_user.profile_image_url_https = None
+        service = UserService()
+
+        for twitter_id, email in (('1', 'bird@example.com'), ('2', None)):
+            with self.subTest(email=email):
+                twitter_user.id_str, twitter_user.screen_name, twitter_user.email = twitter_id, f'bird{twitter_id}', email
+                result = service.authenticate_twitter('oauth-token', 'verifier', role='tenant')
+                user = User.objects.get(username=result['user']['username'])
+                if email:
+                    self.assertEqual(user.email, email)
+                else:
+                    self.assertRegex(user.email, r'^twitter_2_[0-9a-f]{16}@example\.com$')
+
+    def test_social_signup_retries_taken_username(self):
+        """Test a social sign-up that loses the username race retries with the next suffix"""
+        service = UserService()
+        # The first pick was claimed by a concurrent sign-up before the insert
+        with patch.object(UserRepository, 'next_available_username', side_effect=['agent', 'agent1']):
+            user = service._create_social_user('agent', email='racer@example.com', password=None)
+        self.assertEqual(user.username, 'agent1')